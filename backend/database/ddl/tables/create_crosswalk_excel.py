@@ -57,9 +57,15 @@ CREATE TABLE IF NOT EXISTS crosswalk_template (
 );
 """
 
+# Backs the client_id / file_group_name filters used by the crosswalk list endpoints
+crosswalk_template_indexes_ddl = """
+CREATE INDEX IF NOT EXISTS crosswalk_client_fg ON crosswalk_template (client_id, file_group_name);
+"""
+
 def create_crosswalk_template_excel_table(db_path=':memory:', sql_ddl=None):
     con = duckdb.connect(db_path)
     con.execute(crosswalk_template_excel_ddl)
+    con.execute(crosswalk_template_indexes_ddl)
 
     if sql_ddl:
         con.execute(sql_ddl)
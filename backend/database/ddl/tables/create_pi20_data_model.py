@@ -25,6 +25,11 @@ CREATE TABLE IF NOT EXISTS pi20_data_model (
   KEY VARCHAR
 );"""
 
+# Backs the column_name point lookups in the datamodel routes
+pi20_data_model_indexes_ddl = """
+CREATE INDEX IF NOT EXISTS pi20_dm_column_name ON pi20_data_model (COLUMN_NAME);
+"""
+
 def insert_pi20_data_model_from_csv(con, csv_path):
     pi_data_model = pd.read_csv(csv_path)
     con.execute("TRUNCATE TABLE pi20_data_model;")
@@ -34,6 +39,7 @@ def insert_pi20_data_model_from_csv(con, csv_path):
 def create_data_model(db_path=':memory:', sql_ddl=None):
     con = duckdb.connect(db_path)
     con.execute(create_pi20_data_model)
+    con.execute(pi20_data_model_indexes_ddl)
 
     if sql_ddl:
         con.execute(sql_ddl)
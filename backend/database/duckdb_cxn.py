@@ -7,7 +7,17 @@ import duckdb
 load_dotenv()
 
 db_path = os.getenv("DUCKDB_PATH", ":memory:")
-engine = create_engine(f"duckdb:///{db_path}")
+
+# File databases get a QueuePool sized for the threadpool-run routes, failing
+# fast rather than queueing for 30s; :memory: keeps duckdb-engine's
+# SingletonThreadPool, which takes no overflow settings. No pre-ping: the
+# database is embedded, so there are no dropped network connections to detect
+_POOL_OPTIONS = {} if db_path == ":memory:" else {
+    "pool_size": 10,
+    "max_overflow": 10,
+    "pool_timeout": 5,
+}
+engine = create_engine(f"duckdb:///{db_path}", **_POOL_OPTIONS)
 
 from sqlalchemy.orm import sessionmaker
 DuckDBSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
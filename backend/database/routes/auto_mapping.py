@@ -5,10 +5,7 @@ Auto Mapping API Routes
 FastAPI routes for the intelligent automated mapping system.
 """
 
-import sys
-import os
-
-DATASCIENCE_DIR = os.getenv('DATASCIENCE_DIR', os.path.join(os.path.dirname(__file__), '..', '..', 'datascience'))
+import threading
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
@@ -17,8 +14,19 @@ from datascience.auto_mapper import AutoMapper # type: ignore
 
 router = APIRouter(prefix="/api/auto-mapping", tags=["auto-mapping"])
 
-# Initialize the auto mapper
-auto_mapper = AutoMapper()
+_mapper: Optional[AutoMapper] = None
+# The startup warmup and a first request can race to build the mapper; the
+# lock makes the loser wait for the winner's instance instead of building another
+_mapper_lock = threading.Lock()
+
+def get_mapper() -> AutoMapper:
+    """Build the shared AutoMapper on first use instead of at import time"""
+    global _mapper
+    if _mapper is None:
+        with _mapper_lock:
+            if _mapper is None:
+                _mapper = AutoMapper()
+    return _mapper
 
 class SourceColumnRequest(BaseModel):
     """Input model for source column data"""
@@ -65,7 +73,7 @@ async def suggest_mappings(request: BulkMappingRequest):
         ]
         
         # Get suggestions
-        suggestions = auto_mapper.bulk_suggest_mappings(source_columns)
+        suggestions = get_mapper().bulk_suggest_mappings(source_columns)
         
         # Convert to response format
         response = {}
@@ -96,7 +104,7 @@ async def record_correction(request: CorrectionRequest):
     from this feedback to get smarter over time.
     """
     try:
-        auto_mapper.record_correction(
+        get_mapper().record_correction(
             source_column=request.source_column,
             correct_table=request.correct_table,
             correct_column=request.correct_column,
@@ -115,10 +123,11 @@ async def record_correction(request: CorrectionRequest):
 async def get_stats():
     """Get mapping system statistics"""
     try:
+        mapper = get_mapper()
         return {
-            "data_model_fields": len(auto_mapper.data_model_fields),
-            "corrections_learned": len(auto_mapper.correction_history),
-            "pattern_types": len(auto_mapper.pattern_library),
+            "data_model_fields": len(mapper.data_model_fields),
+            "corrections_learned": len(mapper.correction_history),
+            "pattern_types": len(mapper.pattern_library),
             "status": "ready"
         }
         
@@ -129,7 +138,7 @@ async def get_stats():
 async def suggest_single(column_name: str, sample_values: Optional[List[str]] = None):
     """Generate suggestions for a single column"""
     try:
-        suggestions = auto_mapper.generate_mapping_suggestions(column_name, sample_values or [])
+        suggestions = get_mapper().generate_mapping_suggestions(column_name, sample_values or [])
         
         return [
             MappingSuggestionResponse(
@@ -2,135 +2,133 @@
 Updated API routes for crosswalk template functionality
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func
 from typing import List, Dict, Any, Optional
+import hashlib
 import json
 import logging
 import traceback
+import orjson
+from cachetools import TTLCache
 
-from database.duckdb_cxn import DuckDBClient
+from database.duckdb_cxn import DuckDBClient, DuckDBSessionLocal
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Short-lived cache for the aggregate list endpoints (clients, file groups,
+# summary); cleared by every handler that writes to crosswalk_template
+_AGGREGATE_CACHE_TTL = 30
+_aggregate_cache = TTLCache(maxsize=128, ttl=_AGGREGATE_CACHE_TTL)
+# Browsers must revalidate every time so a write is visible on the next read;
+# the ETag turns an unchanged aggregate into a bodiless 304
+_AGGREGATE_CACHE_CONTROL = "no-cache"
+
+def _invalidate_aggregate_cache():
+    """Drop cached aggregates after crosswalk_template changes"""
+    _aggregate_cache.clear()
+
+def _aggregate_response(request: Request, response: Response, payload):
+    """Tag an aggregate payload with an ETag, answering 304 if the client already has it"""
+    etag = f'"{hashlib.blake2b(orjson.dumps(payload), digest_size=16).hexdigest()}"'
+    client_tags = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag in client_tags or "*" in client_tags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _AGGREGATE_CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    return payload
+
+# Columns POST /crosswalk/search may match against
+_SEARCH_FIELDS = frozenset({
+    'source_column_name', 'mcdm_column_name', 'data_profile_info', 'source_column_formatting'
+})
+
+_CROSSWALK_LIST_COLUMNS = """
+    id, client_id, source_column_order, source_column_name, file_group_name,
+    mcdm_column_name, in_model, mcdm_table, custom_field_type,
+    data_profile_info, profile_column_2, profile_column_3, profile_column_4,
+    profile_column_5, profile_column_6, source_column_formatting, skipped_flag,
+    additional_field_1, additional_field_2, additional_field_3, additional_field_4,
+    additional_field_5, additional_field_6, additional_field_7, additional_field_8,
+    target_tables, provider_file_group, is_multi_table, crosswalk_version,
+    parent_mapping_id, reuse_from_client, version_notes, inferred_data_type,
+    custom_data_type, data_type_source, source_file_name, join_key_column,
+    join_table, join_type, mcs_review_required, mcs_review_notes,
+    mcs_review_status, mcs_reviewer, mcs_review_date, complexity_score,
+    business_priority, completion_status, created_at, updated_at
+"""
+
+def _crosswalk_list_sql(by_client: bool, by_file_group: bool):
+    """Build the /crosswalk list statement for one combination of filters"""
+    query = f"SELECT {_CROSSWALK_LIST_COLUMNS} FROM crosswalk_template WHERE 1=1"
+    if by_client:
+        query += " AND client_id = :client_id"
+    if by_file_group:
+        query += " AND file_group_name = :file_group"
+    query += " ORDER BY source_column_order, source_column_name LIMIT :limit OFFSET :offset"
+    return text(query).execution_options(yield_per=200)
+
+# Only four filter combinations exist, so build each TextClause once at import
+_CROSSWALK_LIST_SQL = {
+    (by_client, by_file_group): _crosswalk_list_sql(by_client, by_file_group)
+    for by_client in (False, True)
+    for by_file_group in (False, True)
+}
+
 @router.get("/crosswalk")
 async def get_crosswalk_data(
     client_id: Optional[str] = Query(None),
     file_group: Optional[str] = Query(None),
     limit: int = Query(100, le=1000),
-    offset: int = Query(0),
-    db: Session = Depends(DuckDBClient.get_duckdb)
+    offset: int = Query(0)
 ):
-    """Get crosswalk template data with filtering"""
+    """Get crosswalk template data with filtering, streamed as it is fetched"""
+    
+    # The stream outlives the request handler, so it owns its session
+    # rather than borrowing the request-scoped one from get_duckdb
+    db = DuckDBSessionLocal()
     
     try:
         logger.info(f"Starting crosswalk query with params: client_id={client_id}, file_group={file_group}, limit={limit}, offset={offset}")
         
-        # Build base query - select all columns from the table
-        query = """
-            SELECT 
-                id, client_id, source_column_order, source_column_name, file_group_name,
-                mcdm_column_name, in_model, mcdm_table, custom_field_type,
-                data_profile_info, profile_column_2, profile_column_3, profile_column_4,
-                profile_column_5, profile_column_6, source_column_formatting, skipped_flag,
-                additional_field_1, additional_field_2, additional_field_3, additional_field_4,
-                additional_field_5, additional_field_6, additional_field_7, additional_field_8,
-                target_tables, provider_file_group, is_multi_table, crosswalk_version,
-                parent_mapping_id, reuse_from_client, version_notes, inferred_data_type,
-                custom_data_type, data_type_source, source_file_name, join_key_column,
-                join_table, join_type, mcs_review_required, mcs_review_notes,
-                mcs_review_status, mcs_reviewer, mcs_review_date, complexity_score,
-                business_priority, completion_status, created_at, updated_at
-            FROM crosswalk_template
-            WHERE 1=1
-        """
-        params = {}
-        
+        params = {'limit': limit, 'offset': offset}
         if client_id:
-            query += " AND client_id = :client_id"
             params['client_id'] = client_id
-        
         if file_group:
-            query += " AND file_group_name = :file_group"
             params['file_group'] = file_group
-        
-        query += " ORDER BY source_column_order, source_column_name"
-        query += " LIMIT :limit OFFSET :offset"
-        params['limit'] = limit
-        params['offset'] = offset
+        query = _CROSSWALK_LIST_SQL[bool(client_id), bool(file_group)]
         
         logger.info(f"Executing query: {query}")
         logger.info(f"Query parameters: {params}")
         
-        result = db.execute(text(query), params).fetchall()
-        logger.info(f"Query returned {len(result)} rows")
-        
-        # Convert to list of dictionaries - all columns from the table
-        columns = [
-            'id', 'client_id', 'source_column_order', 'source_column_name', 'file_group_name',
-            'mcdm_column_name', 'in_model', 'mcdm_table', 'custom_field_type',
-            'data_profile_info', 'profile_column_2', 'profile_column_3', 'profile_column_4',
-            'profile_column_5', 'profile_column_6', 'source_column_formatting', 'skipped_flag',
-            'additional_field_1', 'additional_field_2', 'additional_field_3', 'additional_field_4',
-            'additional_field_5', 'additional_field_6', 'additional_field_7', 'additional_field_8',
-            'target_tables', 'provider_file_group', 'is_multi_table', 'crosswalk_version',
-            'parent_mapping_id', 'reuse_from_client', 'version_notes', 'inferred_data_type',
-            'custom_data_type', 'data_type_source', 'source_file_name', 'join_key_column',
-            'join_table', 'join_type', 'mcs_review_required', 'mcs_review_notes',
-            'mcs_review_status', 'mcs_reviewer', 'mcs_review_date', 'complexity_score',
-            'business_priority', 'completion_status', 'created_at', 'updated_at'
-        ]
-        
-        logger.info(f"Expected columns count: {len(columns)}")
-        
-        data = []
-        for i, row in enumerate(result):
-            try:
-                logger.debug(f"Processing row {i}: type={type(row)}, has_asdict={hasattr(row, '_asdict')}, has_mapping={hasattr(row, '_mapping')}")
-                
-                # Log the actual row structure for debugging
-                if hasattr(row, '__len__'):
-                    logger.debug(f"Row {i} length: {len(row)}")
-                
-                # Convert SQLAlchemy row to dict using _asdict() method
-                # This is safer than manual indexing and handles column mismatches
-                if hasattr(row, '_asdict'):
-                    row_dict = row._asdict()
-                    logger.debug(f"Row {i} converted using _asdict(): {len(row_dict)} fields")
-                else:
-                    # Fallback: convert to dict using column names from the result
-                    if hasattr(row, '_mapping'):
-                        row_dict = dict(row._mapping)
-                        logger.debug(f"Row {i} converted using _mapping: {len(row_dict)} fields")
-                    else:
-                        row_dict = dict(row)
-                        logger.debug(f"Row {i} converted using dict(): {len(row_dict)} fields")
-                
-                data.append(row_dict)
-                
-            except Exception as row_error:
-                logger.error(f"Error processing row {i}: {str(row_error)}")
-                logger.error(f"Row {i} details: type={type(row)}")
-                logger.error(f"Row {i} traceback: {traceback.format_exc()}")
-                raise row_error
-        
-        logger.info(f"Successfully processed {len(data)} rows")
-        
-        return {
-            "data": data,
-            "total": len(data),
-            "offset": offset,
-            "limit": limit
-        }
+        # Fetch in batches of 200 so memory stays bounded by the batch size
+        result = db.execute(query, params).mappings()
         
     except Exception as e:
+        db.close()
         logger.error(f"Error in get_crosswalk_data: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    
+    def stream_rows():
+        total = 0
+        try:
+            yield b'{"data":['
+            for batch in result.partitions():
+                if total:
+                    yield b','
+                yield b','.join(orjson.dumps(dict(row)) for row in batch)
+                total += len(batch)
+            logger.info(f"Streamed {total} rows")
+            yield b'],"total":%d,"offset":%d,"limit":%d}' % (total, offset, limit)
+        finally:
+            db.close()
+    
+    return StreamingResponse(stream_rows(), media_type="application/json")
 
 @router.post("/crosswalk/{mapping_id}/duplicate")
 async def duplicate_crosswalk_mapping(
@@ -141,88 +139,51 @@ async def duplicate_crosswalk_mapping(
     """Duplicate a crosswalk mapping with new table assignment"""
     
     try:
-        # Get the original mapping using the same query structure as other endpoints
-        original_query = """
-            SELECT 
+        # Clone the row server-side in one statement, overriding only mcdm_table
+        # (when provided) and the timestamps; no row means the original is missing
+        duplicate_query = """
+            INSERT INTO crosswalk_template (
                 client_id, source_column_order, source_column_name, file_group_name,
                 mcdm_column_name, in_model, mcdm_table, custom_field_type,
                 data_profile_info, profile_column_2, profile_column_3, profile_column_4,
                 profile_column_5, profile_column_6, source_column_formatting, skipped_flag,
                 additional_field_1, additional_field_2, additional_field_3, additional_field_4,
-                additional_field_5, additional_field_6, additional_field_7, additional_field_8
-            FROM crosswalk_template 
-            WHERE id = :id
-        """
-        
-        original = db.execute(text(original_query), {'id': mapping_id}).fetchone()
-        
-        if not original:
-            raise HTTPException(status_code=404, detail="Original mapping not found")
-        
-        # Create new mapping with duplicated data
-        new_table = data.get('mcdm_table', original[6])  # mcdm_table is index 6
-        
-        insert_query = """
-            INSERT INTO crosswalk_template (
+                additional_field_5, additional_field_6, additional_field_7, additional_field_8,
+                created_at, updated_at
+            )
+            SELECT 
                 client_id, source_column_order, source_column_name, file_group_name,
-                mcdm_column_name, in_model, mcdm_table, custom_field_type,
+                mcdm_column_name, in_model,
+                CASE WHEN :override_table THEN :mcdm_table ELSE mcdm_table END,
+                custom_field_type,
                 data_profile_info, profile_column_2, profile_column_3, profile_column_4,
                 profile_column_5, profile_column_6, source_column_formatting, skipped_flag,
                 additional_field_1, additional_field_2, additional_field_3, additional_field_4,
                 additional_field_5, additional_field_6, additional_field_7, additional_field_8,
-                created_at, updated_at
-            ) VALUES (
-                :client_id, :source_column_order, :source_column_name, :file_group_name,
-                :mcdm_column_name, :in_model, :mcdm_table, :custom_field_type,
-                :data_profile_info, :profile_column_2, :profile_column_3, :profile_column_4,
-                :profile_column_5, :profile_column_6, :source_column_formatting, :skipped_flag,
-                :additional_field_1, :additional_field_2, :additional_field_3, :additional_field_4,
-                :additional_field_5, :additional_field_6, :additional_field_7, :additional_field_8,
                 CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-            )
+            FROM crosswalk_template 
+            WHERE id = :id
+            RETURNING id
         """
         
-        # Prepare data for new mapping
-        new_mapping_data = {
-            'client_id': original[0],
-            'source_column_order': original[1],
-            'source_column_name': original[2],
-            'file_group_name': original[3],
-            'mcdm_column_name': original[4],
-            'in_model': original[5],
-            'mcdm_table': new_table,
-            'custom_field_type': original[7],
-            'data_profile_info': original[8],
-            'profile_column_2': original[9],
-            'profile_column_3': original[10],
-            'profile_column_4': original[11],
-            'profile_column_5': original[12],
-            'profile_column_6': original[13],
-            'source_column_formatting': original[14],
-            'skipped_flag': original[15],
-            'additional_field_1': original[16],
-            'additional_field_2': original[17],
-            'additional_field_3': original[18],
-            'additional_field_4': original[19],
-            'additional_field_5': original[20],
-            'additional_field_6': original[21],
-            'additional_field_7': original[22],
-            'additional_field_8': original[23]
-        }
+        new_record = db.execute(text(duplicate_query), {
+            'id': mapping_id,
+            'override_table': 'mcdm_table' in data,
+            'mcdm_table': data.get('mcdm_table')
+        }).fetchone()
         
-        db.execute(text(insert_query), new_mapping_data)
-        db.commit()
-        
-        # Get the new ID by finding the most recent insertion
-        new_record = db.execute(
-            text("SELECT id FROM crosswalk_template WHERE client_id = :client_id AND source_column_name = :source_column_name AND mcdm_table = :mcdm_table ORDER BY created_at DESC LIMIT 1"),
-            {'client_id': original[0], 'source_column_name': original[2], 'mcdm_table': new_table}
-        ).fetchone()
+        if not new_record:
+            raise HTTPException(status_code=404, detail="Original mapping not found")
         
-        new_id = new_record[0] if new_record else None
+        db.commit()
+        _invalidate_aggregate_cache()
+        new_id = new_record[0]
         
         return {"success": True, "message": "Mapping duplicated successfully", "new_id": new_id}
         
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to duplicate mapping: {str(e)}")
@@ -235,15 +196,6 @@ async def update_crosswalk_mapping(
 ):
     """Update a crosswalk mapping"""
     
-    # Check if mapping exists
-    existing = db.execute(
-        text("SELECT id FROM crosswalk_template WHERE id = :id"),
-        {'id': mapping_id}
-    ).fetchone()
-    
-    if not existing:
-        raise HTTPException(status_code=404, detail="Mapping not found")
-    
     # Build update query dynamically based on provided fields
     allowed_fields = [
         'client_id', 'source_column_order', 'source_column_name', 'file_group_name',
@@ -272,34 +224,55 @@ async def update_crosswalk_mapping(
         UPDATE crosswalk_template 
         SET {', '.join(updates)}
         WHERE id = :id
+        RETURNING id
     """
     
-    db.execute(text(update_query), params)
+    # RETURNING doubles as the existence check, so a missing id costs no extra query
+    updated = db.execute(text(update_query), params).fetchone()
+    if not updated:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Mapping not found")
+    
     db.commit()
+    _invalidate_aggregate_cache()
     
     return {"success": True, "message": "Mapping updated successfully"}
 
 @router.get("/crosswalk/clients")
-async def get_clients(db: Session = Depends(DuckDBClient.get_duckdb)):
+async def get_clients(request: Request, response: Response, db: Session = Depends(DuckDBClient.get_duckdb)):
     """Get list of unique clients"""
+    response.headers["Cache-Control"] = _AGGREGATE_CACHE_CONTROL
+    cache_key = ('clients',)
+    if cache_key in _aggregate_cache:
+        return _aggregate_response(request, response, _aggregate_cache[cache_key])
+    
     result = db.execute(text("""
-        SELECT DISTINCT client_id, COUNT(*) as mapping_count
+        SELECT client_id, COUNT(*) as mapping_count
         FROM crosswalk_template 
         WHERE client_id IS NOT NULL AND client_id != ''
         GROUP BY client_id
         ORDER BY client_id
     """)).fetchall()
     
-    return [{"client_id": row[0], "mapping_count": row[1]} for row in result]
+    clients = [{"client_id": row[0], "mapping_count": row[1]} for row in result]
+    _aggregate_cache[cache_key] = clients
+    return _aggregate_response(request, response, clients)
 
 @router.get("/crosswalk/file-groups")
 async def get_file_groups(
+    request: Request,
+    response: Response,
     client_id: Optional[str] = Query(None),
     db: Session = Depends(DuckDBClient.get_duckdb)
 ):
     """Get list of file groups, optionally filtered by client"""
+    response.headers["Cache-Control"] = _AGGREGATE_CACHE_CONTROL
+    cache_key = ('file_groups', client_id)
+    if cache_key in _aggregate_cache:
+        return _aggregate_response(request, response, _aggregate_cache[cache_key])
+    
     query = """
-        SELECT DISTINCT file_group_name, COUNT(*) as mapping_count
+        SELECT file_group_name, COUNT(*) as mapping_count
         FROM crosswalk_template 
         WHERE file_group_name IS NOT NULL AND file_group_name != ''
     """
@@ -313,45 +286,64 @@ async def get_file_groups(
     
     result = db.execute(text(query), params).fetchall()
     
-    return [{"file_group": row[0], "mapping_count": row[1]} for row in result]
+    file_groups = [{"file_group": row[0], "mapping_count": row[1]} for row in result]
+    _aggregate_cache[cache_key] = file_groups
+    return _aggregate_response(request, response, file_groups)
 
 @router.get("/crosswalk/summary")
-async def get_crosswalk_summary(db: Session = Depends(DuckDBClient.get_duckdb)):
+async def get_crosswalk_summary(request: Request, response: Response, db: Session = Depends(DuckDBClient.get_duckdb)):
     """Get summary statistics for the crosswalk data"""
+    response.headers["Cache-Control"] = _AGGREGATE_CACHE_CONTROL
+    cache_key = ('summary',)
+    if cache_key in _aggregate_cache:
+        return _aggregate_response(request, response, _aggregate_cache[cache_key])
     
-    # Get basic counts
-    total_mappings = db.execute(text("SELECT COUNT(*) FROM crosswalk_template")).scalar()
-    total_clients = db.execute(text("SELECT COUNT(DISTINCT client_id) FROM crosswalk_template WHERE client_id IS NOT NULL")).scalar()
-    total_file_groups = db.execute(text("SELECT COUNT(DISTINCT file_group_name) FROM crosswalk_template WHERE file_group_name IS NOT NULL")).scalar()
+    # Get basic counts and skipped fields in a single scan
+    # (COUNT(DISTINCT ...) already ignores NULLs)
+    totals = db.execute(text("""
+        SELECT
+            COUNT(*) AS total_mappings,
+            COUNT(DISTINCT client_id) AS total_clients,
+            COUNT(DISTINCT file_group_name) AS total_file_groups,
+            COUNT(*) FILTER (WHERE skipped_flag = true) AS skipped_count
+        FROM crosswalk_template
+    """)).fetchone()
     
-    # Get in_model distribution
-    in_model_stats = db.execute(text("""
-        SELECT in_model, COUNT(*) as count
+    # Get in_model and top-10 file group distributions in one round-trip,
+    # tagged with a kind column so they can be split apart below
+    distribution_rows = db.execute(text("""
+        SELECT 'in_model' AS kind, in_model AS value, COUNT(*) AS count
         FROM crosswalk_template 
         GROUP BY in_model
-        ORDER BY count DESC
+        UNION ALL
+        SELECT kind, value, count FROM (
+            SELECT 'file_group' AS kind, file_group_name AS value, COUNT(*) AS count
+            FROM crosswalk_template 
+            GROUP BY file_group_name
+            ORDER BY count DESC
+            LIMIT 10
+        ) AS top_file_groups
+        ORDER BY kind, count DESC
     """)).fetchall()
     
-    # Get skipped fields count
-    skipped_count = db.execute(text("SELECT COUNT(*) FROM crosswalk_template WHERE skipped_flag = true")).scalar()
+    in_model_distribution = []
+    file_group_distribution = []
+    for kind, value, count in distribution_rows:
+        if kind == 'in_model':
+            in_model_distribution.append({"in_model": value, "count": count})
+        else:
+            file_group_distribution.append({"file_group": value, "count": count})
     
-    # Get file group distribution
-    file_group_stats = db.execute(text("""
-        SELECT file_group_name, COUNT(*) as count
-        FROM crosswalk_template 
-        GROUP BY file_group_name
-        ORDER BY count DESC
-        LIMIT 10
-    """)).fetchall()
-    
-    return {
-        "total_mappings": total_mappings,
-        "total_clients": total_clients,
-        "total_file_groups": total_file_groups,
-        "skipped_fields": skipped_count,
-        "in_model_distribution": [{"in_model": row[0], "count": row[1]} for row in in_model_stats],
-        "file_group_distribution": [{"file_group": row[0], "count": row[1]} for row in file_group_stats]
+    summary = {
+        "total_mappings": totals[0],
+        "total_clients": totals[1],
+        "total_file_groups": totals[2],
+        "skipped_fields": totals[3],
+        "in_model_distribution": in_model_distribution,
+        "file_group_distribution": file_group_distribution
     }
+    _aggregate_cache[cache_key] = summary
+    return _aggregate_response(request, response, summary)
 
 @router.post("/crosswalk/search")
 async def search_crosswalk(
@@ -366,15 +358,10 @@ async def search_crosswalk(
     if not search_term:
         return {"data": [], "total": 0}
     
-    # Build search query
-    conditions = []
-    params = {}
-    
-    for i, field in enumerate(search_fields):
-        if field in ['source_column_name', 'mcdm_column_name', 'data_profile_info', 'source_column_formatting']:
-            param_name = f'search_term_{i}'
-            conditions.append(f"{field} ILIKE :%{param_name}%")
-            params[param_name] = f"%{search_term}%"
+    # Build search query - only allow-listed column names are interpolated,
+    # and every field shares the single bound pattern
+    conditions = [f"{field} ILIKE :q" for field in search_fields if field in _SEARCH_FIELDS]
+    params = {'q': f"%{search_term}%"}
     
     if not conditions:
         return {"data": [], "total": 0}
@@ -437,11 +424,10 @@ async def insert_demo_crosswalk(
         
         print(f"Processing {len(data)} rows")
         
+        required_keys = ["client_id", "source_column_order", "source_column_name", "file_group_name"]
+        rows = []
+        
         for i, row in enumerate(data):
-            print(f"Processing row {i}: {row}")
-            
-            required_keys = ["client_id", "source_column_order", "source_column_name", "file_group_name"]
-            
             if not isinstance(row, dict):
                 print(f"ERROR: Row {i} is not a dict: {type(row)} - {row}")
                 raise HTTPException(status_code=422, detail=f"Each item must be an object. Row {i}: {row}")
@@ -457,7 +443,12 @@ async def insert_demo_crosswalk(
                 print(f"ERROR: source_column_order should be int/str, got {type(row.get('source_column_order'))}")
                 raise HTTPException(status_code=422, detail=f"source_column_order must be int or string in row {i}")
             
-            print(f"Inserting row {i}: {row}")
+            # Keep only the bound columns so the batch carries no unused keys
+            rows.append({k: row[k] for k in required_keys})
+        
+        # Insert every validated row in a single executemany round-trip
+        if rows:
+            print(f"Inserting {len(rows)} rows")
             db.execute(
                 text("""
                     INSERT INTO crosswalk_template (
@@ -466,11 +457,12 @@ async def insert_demo_crosswalk(
                         :client_id, :source_column_order, :source_column_name, :file_group_name
                     )
                 """),
-                row
+                rows
             )
         
         # Commit the transaction if using one
         db.commit()
+        _invalidate_aggregate_cache()
         
         # ------ LOG THE CONFIRMATION BEFORE PROCEEDING -----
         result = db.execute(
@@ -3,22 +3,16 @@ Data Model Intelligence API - provides PI20 data model assistance and validation
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import String, bindparam, text
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
+from cachetools import TTLCache
+from fuzzywuzzy import fuzz, utils
+import heapq
 
-
-import sys
-import os
-
-database_file = os.getenv("DATABASE_FILE", ":memory:")
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-
-# Use only DuckDB for database dependency injection
 from database.duckdb_cxn import DuckDBClient
-get_db = DuckDBClient.get_duckdb
 
 router = APIRouter(prefix="/api/datamodel", tags=["datamodel"])
 
@@ -50,6 +44,122 @@ class FieldSuggestion(BaseModel):
     confidence_score: float
     reason: str
 
+# NULLs are defaulted in SQL so each row maps straight onto the
+# DataModelField shape without per-cell coercion in Python
+_FIELDS_COLUMNS = """
+    ROW_NUMBER() OVER (ORDER BY TABLE_NAME, COLUMN_NAME) as id,
+    COALESCE(IN_CROSSWALK, '') as in_crosswalk,
+    COALESCE(TABLE_NAME, '') as table_name,
+    COALESCE(COLUMN_NAME, '') as column_name,
+    COALESCE(COLUMN_TYPE, '') as column_type,
+    COALESCE(COLUMN_ORDER, 0) as column_order,
+    COALESCE(COLUMN_COMMENT, '') as column_comment,
+    COALESCE(TABLE_CREATION_ORDER, 0) as table_creation_order,
+    COALESCE(IS_MANDATORY, false) as is_mandatory,
+    COALESCE(MANDATORY_PROV_TYPE, '') as mandatory_prov_type,
+    COALESCE(MCDM_MASKING_TYPE, '') as mcdm_masking_type,
+    COALESCE(IN_EDITS, false) as in_edits,
+    COALESCE(KEY, '') as key
+"""
+
+def _fields_sql(by_table: bool, by_search: bool):
+    """Build the /datamodel fields statement for one combination of filters"""
+    query = f"SELECT {_FIELDS_COLUMNS} FROM pi20_data_model WHERE 1=1"
+    if by_table:
+        query += " AND table_name = :table_name"
+    if by_search:
+        # Plain substring test: no LIKE pattern to build, and user-typed % or _ match literally
+        query += " AND (contains(lower(column_name), :search) OR contains(lower(column_comment), :search))"
+    query += " ORDER BY table_name, column_name"
+    return text(query).execution_options(yield_per=500)
+
+# Statements are built once at import so each request reuses the same
+# TextClause and hits SQLAlchemy's compiled cache
+_FIELDS_SQL = {
+    (by_table, by_search): _fields_sql(by_table, by_search)
+    for by_table in (False, True)
+    for by_search in (False, True)
+}
+
+# pi20_data_model has no schema layer column: every row belongs to the one
+# PI20 model, so suggestions report that as their layer
+_SCHEMA_LAYER = "PI20"
+
+# DuckDB reports unaliased columns under their declared upper-case names, so
+# each one is aliased to the attribute name the handlers read off the row.
+# The typed bindparam keeps an empty IN list rendering as VARCHAR, not INTEGER
+_SUGGEST_SQL = text(f"""
+    SELECT '{_SCHEMA_LAYER}' AS schema_layer, TABLE_NAME AS table_name, COLUMN_NAME AS column_name,
+           COLUMN_NAME ILIKE :column AS is_exact
+    FROM pi20_data_model
+    WHERE COLUMN_NAME ILIKE :column OR COLUMN_NAME IN :fields
+""").bindparams(bindparam("fields", expanding=True, type_=String))
+
+_COLUMNS_SQL = text(
+    f"SELECT COLUMN_NAME AS column_name, '{_SCHEMA_LAYER}' AS schema_layer, TABLE_NAME AS table_name "
+    "FROM pi20_data_model"
+)
+
+_TARGET_SQL = text("""
+    SELECT TABLE_NAME AS table_name, COLUMN_TYPE AS column_type, COLUMN_COMMENT AS column_comment
+    FROM pi20_data_model 
+    WHERE COLUMN_NAME = :column
+    LIMIT 1
+""")
+
+# The single PI20 layer is listed only once the data model has been loaded
+_SCHEMA_LAYERS_SQL = text(f"SELECT DISTINCT '{_SCHEMA_LAYER}' AS schema_layer FROM pi20_data_model")
+
+_TABLES_SQL = text("SELECT DISTINCT TABLE_NAME AS table_name FROM pi20_data_model ORDER BY table_name")
+
+# Every table sits in the PI20 layer, so the filter keeps all of them or none
+_TABLES_BY_SCHEMA_SQL = text(f"""
+    SELECT DISTINCT TABLE_NAME AS table_name FROM pi20_data_model
+    WHERE upper(:schema_layer) = '{_SCHEMA_LAYER}'
+    ORDER BY table_name
+""")
+
+# Every row is a standard PI20 field, and the model records no case
+# sensitivity, so those two flags are constants rather than columns
+_FIELD_INFO_SQL = text(f"""
+    SELECT '{_SCHEMA_LAYER}' AS schema_layer, TABLE_NAME AS table_name, COLUMN_NAME AS column_name,
+           COLUMN_TYPE AS data_type, COLUMN_COMMENT AS description,
+           COALESCE(IS_MANDATORY, false) AS is_mandatory,
+           true AS is_standard_field, false AS is_case_sensitive
+    FROM pi20_data_model 
+    WHERE COLUMN_NAME ILIKE :column
+    ORDER BY table_name
+""")
+
+# pi20_data_model is reference data loaded by the DDL scripts and never
+# written through the API, so lookups against it are kept for a few minutes
+_REFERENCE_CACHE_TTL = 300
+_reference_cache = TTLCache(maxsize=1024, ttl=_REFERENCE_CACHE_TTL)
+_MISSING = object()
+
+def _cached(key, load):
+    """Return the cached value for key, calling load() to fill it on a miss"""
+    value = _reference_cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = _reference_cache[key] = load()
+    return value
+
+def _data_model_columns(db: Session) -> Dict[str, Any]:
+    """Map each data model column name to its first (schema_layer, table_name) row"""
+    def load():
+        columns = {}
+        for row in db.execute(_COLUMNS_SQL):
+            if row.column_name:
+                columns.setdefault(row.column_name, row)
+        return columns
+    return _cached(('columns',), load)
+
+def _fuzzy_choices(db: Session) -> List[tuple]:
+    """Data model column names paired with their WRatio-normalised form, processed once"""
+    return _cached(('fuzzy_choices',), lambda: [
+        (utils.full_process(name, force_ascii=True), name) for name in _data_model_columns(db)
+    ])
+
 @router.get("", response_model=List[DataModelField])
 async def get_data_model_fields(
     schema_layer: Optional[str] = None,
@@ -59,56 +169,17 @@ async def get_data_model_fields(
 ):
     """Get PI20 data model fields with optional filtering"""
     
-    query = """
-        SELECT 
-        ROW_NUMBER() OVER (ORDER BY TABLE_NAME, COLUMN_NAME) as id,
-        IN_CROSSWALK,
-        TABLE_NAME,
-        COLUMN_NAME,
-        COLUMN_TYPE,
-        COLUMN_ORDER,
-        COLUMN_COMMENT,
-        TABLE_CREATION_ORDER,
-        IS_MANDATORY,
-        MANDATORY_PROV_TYPE,
-        MCDM_MASKING_TYPE,
-        IN_EDITS,
-        KEY
-        FROM pi20_data_model
-        WHERE 1=1
-    """
     params = {}
-
     if table_name:
-        query += " AND table_name = :table_name"
         params["table_name"] = table_name
-    
     if search:
-        query += " AND (column_name ILIKE :search OR description ILIKE :search)"
-        params["search"] = f"%{search}%"
+        params["search"] = search.lower()
     
-    query += " ORDER BY table_name, column_name"
-    
-    result = db.execute(text(query), params)
+    result = db.execute(_FIELDS_SQL[bool(table_name), bool(search)], params).mappings()
     
-    return [
-        DataModelField(
-            id=int(row[0]) if row[0] is not None else 0,
-            in_crosswalk=str(row[1]) if row[1] is not None else "",
-            table_name=str(row[2]) if row[2] is not None else "",
-            column_name=str(row[3]) if row[3] is not None else "",
-            column_type=str(row[4]) if row[4] is not None else "",
-            column_order=int(row[5]) if row[5] is not None else 0,
-            column_comment=str(row[6]) if row[6] is not None else "",
-            table_creation_order=int(row[7]) if row[7] is not None else 0,
-            is_mandatory=bool(row[8]) if row[8] is not None else False,
-            mandatory_prov_type=str(row[9]) if row[9] is not None else "",
-            mcdm_masking_type=str(row[10]) if row[10] is not None else "",
-            in_edits=bool(row[11]) if row[11] is not None else False,
-            key=str(row[12]) if row[12] is not None else ""
-        )
-        for row in result
-    ]
+    # Returning the response directly skips response_model validation; the
+    # model still documents the shape in the OpenAPI schema
+    return ORJSONResponse([dict(row) for row in result])
 
 @router.get("/suggest-mapping")
 async def suggest_mapping(
@@ -119,23 +190,6 @@ async def suggest_mapping(
     """Suggest PI20 data model fields for a source column"""
     
     suggestions = []
-    
-    # Exact name match
-    exact_match = db.execute(
-        text("SELECT schema_layer, table_name, column_name FROM pi20_data_model WHERE column_name ILIKE :column"),
-        {"column": source_column}
-    ).fetchall()
-    
-    for row in exact_match:
-        suggestions.append(FieldSuggestion(
-            column_name=row[2],
-            table_name=row[1],
-            schema_layer=row[0],
-            confidence_score=1.0,
-            reason="Exact column name match"
-        ))
-    
-    # Partial matches and common patterns
     source_lower = source_column.lower()
     
     # Common patterns for healthcare data
@@ -148,24 +202,79 @@ async def suggest_mapping(
         'procedure': ['procedure_1', 'procedure_2', 'procedure_code'],
         'amount': ['allowed_amount', 'paid_amount'],
     }
+    candidate_fields = [
+        field
+        for category, fields in patterns.items() if category in source_lower
+        for field in fields
+    ]
+    
+    # Fetch the exact match and every pattern candidate in one round-trip
+    rows = db.execute(
+        _SUGGEST_SQL, {"column": source_column, "fields": candidate_fields}
+    ).fetchall()
+    
+    # Exact name match
+    for row in rows:
+        if row.is_exact:
+            suggestions.append(FieldSuggestion(
+                column_name=row.column_name,
+                table_name=row.table_name,
+                schema_layer=row.schema_layer,
+                confidence_score=1.0,
+                reason="Exact column name match"
+            ))
+    
+    # Nothing below scores above an exact match, so a full page of them is final
+    if len(suggestions) >= 10:
+        return suggestions[:10]
+    
+    # Partial matches and common patterns
+    rows_by_column = {}
+    for row in rows:
+        rows_by_column.setdefault(row.column_name, row)
+    seen = {s.column_name for s in suggestions}
     
     for category, fields in patterns.items():
         if category in source_lower:
             for field in fields:
-                field_info = db.execute(
-                    text("SELECT schema_layer, table_name FROM pi20_data_model WHERE column_name = :field LIMIT 1"),
-                    {"field": field}
-                ).fetchone()
+                field_info = rows_by_column.get(field)
                 
-                if field_info and not any(s.column_name == field for s in suggestions):
+                if field_info and field not in seen:
+                    seen.add(field)
                     suggestions.append(FieldSuggestion(
                         column_name=field,
-                        table_name=field_info[1],
-                        schema_layer=field_info[0],
+                        table_name=field_info.table_name,
+                        schema_layer=field_info.schema_layer,
                         confidence_score=0.8,
                         reason=f"Common pattern for {category} fields"
                     ))
     
+    # Fuzzy name matches catch abbreviations and typos the patterns miss
+    query = utils.full_process(source_column, force_ascii=True)
+    scored = []
+    for processed, field in _fuzzy_choices(db) if query else ():
+        # Past an 8:1 length ratio WRatio tops out at 60, below the cutoff,
+        # so skip the distance work entirely
+        shorter, longer = sorted((len(query), len(processed)))
+        if not shorter or longer > 8 * shorter:
+            continue
+        score = fuzz.WRatio(query, processed, full_process=False)
+        if score >= 70:
+            scored.append((field, score))
+    
+    data_model_columns = _data_model_columns(db)
+    for field, score in heapq.nlargest(10, scored, key=lambda pair: pair[1]):
+        if field not in seen and field in data_model_columns:
+            seen.add(field)
+            field_info = data_model_columns[field]
+            suggestions.append(FieldSuggestion(
+                column_name=field,
+                table_name=field_info.table_name,
+                schema_layer=field_info.schema_layer,
+                confidence_score=score / 100,
+                reason=f"Similar column name ({score}% match)"
+            ))
+    
     # Sort by confidence score
     suggestions.sort(key=lambda x: x.confidence_score, reverse=True)
     
@@ -195,20 +304,9 @@ async def validate_mapping(
             'field': 'mcdm_column_name'
         })
     
-    # Rule 2: Check if MCDM column requires case sensitivity handling
-    if mcdm_column_name:
-        case_sensitive_check = db.execute(
-            text("SELECT is_case_sensitive FROM pi20_data_model WHERE column_name = :column LIMIT 1"),
-            {"column": mcdm_column_name}
-        ).fetchone()
-        
-        if case_sensitive_check and case_sensitive_check[0] and not source_column_formatting:
-            violations.append({
-                'rule': 'VARCHAR_FIELDS_CASE_SENSITIVITY',
-                'message': f'{mcdm_column_name} is case-sensitive and requires UPPER() or LOWER() function',
-                'field': 'source_column_formatting'
-            })
-            suggestions.append(f"Try: UPPER({mapping_data.get('source_column_name', 'column_name')})")
+    # Rule 2 (VARCHAR_FIELDS_CASE_SENSITIVITY) is intentionally not checked:
+    # pi20_data_model records no case sensitivity for its fields, and the
+    # column type alone cannot tell which VARCHAR fields need UPPER()/LOWER()
     
     # Rule 3: Custom fields validation
     if in_model == 'N' and not custom_field_type:
@@ -229,21 +327,15 @@ async def validate_mapping(
     
     # Additional suggestions based on data model
     if mcdm_column_name and in_model == 'Y':
-        field_info = db.execute(
-            text("""
-                SELECT schema_layer, table_name, data_type, description 
-                FROM pi20_data_model 
-                WHERE column_name = :column
-            """),
-            {"column": mcdm_column_name}
-        ).fetchone()
-        
+        field_info = _cached(('target', mcdm_column_name), lambda: db.execute(
+            _TARGET_SQL, {"column": mcdm_column_name}
+        ).fetchone())
         if field_info:
-            schema_layer, table_name, data_type, description = field_info
-            if not source_column_formatting and 'VARCHAR' in data_type:
-                suggestions.append(f"Consider data type formatting for {data_type}")
+            table_name, column_type, column_comment = field_info
+            if not source_column_formatting and 'VARCHAR' in (column_type or ''):
+                suggestions.append(f"Consider data type formatting for {column_type}")
             
-            suggestions.append(f"Target: {schema_layer}.{table_name}.{mcdm_column_name} - {description}")
+            suggestions.append(f"Target: {_SCHEMA_LAYER}.{table_name}.{mcdm_column_name} - {column_comment}")
     
     is_valid = len(violations) == 0
     
@@ -255,13 +347,11 @@ async def validate_mapping(
 
 @router.get("/schema-layers")
 async def get_schema_layers(db: Session = Depends(DuckDBClient.get_duckdb)):
-    """Get available schema layers (RAW, CLEANSE, CURATED)"""
-    
-    result = db.execute(
-        text("SELECT DISTINCT schema_layer FROM pi20_data_model ORDER BY schema_layer")
-    )
+    """Get available schema layers (the data model has the single PI20 layer)"""
     
-    return [row[0] for row in result]
+    return _cached(('schema_layers',), lambda: [
+        row[0] for row in db.execute(_SCHEMA_LAYERS_SQL)
+    ])
 
 @router.get("/tables")
 async def get_tables(
@@ -270,18 +360,14 @@ async def get_tables(
 ):
     """Get available tables in the data model"""
     
-    query = "SELECT DISTINCT table_name FROM pi20_data_model"
-    params = {}
-    
     if schema_layer:
-        query += " WHERE schema_layer = :schema_layer"
-        params["schema_layer"] = schema_layer
+        query, params = _TABLES_BY_SCHEMA_SQL, {"schema_layer": schema_layer}
+    else:
+        query, params = _TABLES_SQL, {}
     
-    query += " ORDER BY table_name"
-    
-    result = db.execute(text(query), params)
-    
-    return [row[0] for row in result]
+    return _cached(('tables', schema_layer), lambda: [
+        row[0] for row in db.execute(query, params)
+    ])
 
 @router.get("/field-info/{column_name}")
 async def get_field_info(
@@ -290,29 +376,11 @@ async def get_field_info(
 ):
     """Get detailed information about a specific field"""
     
-    result = db.execute(
-        text("""
-            SELECT schema_layer, table_name, column_name, data_type, description,
-                   is_standard_field, is_case_sensitive
-            FROM pi20_data_model 
-            WHERE column_name ILIKE :column
-            ORDER BY schema_layer, table_name
-        """),
-        {"column": column_name}
-    ).fetchall()
+    result = _cached(('field_info', column_name), lambda: db.execute(
+        _FIELD_INFO_SQL, {"column": column_name}
+    ).fetchall())
     
     if not result:
         raise HTTPException(status_code=404, detail=f"Field {column_name} not found in data model")
     
-    return [
-        {
-            "schema_layer": row[0],
-            "table_name": row[1],
-            "column_name": row[2],
-            "data_type": row[3],
-            "description": row[4],
-            "is_standard_field": row[5],
-            "is_case_sensitive": row[6]
-        }
-        for row in result
-    ]
\ No newline at end of file
+    return [dict(row._mapping) for row in result]
\ No newline at end of file
@@ -17,10 +17,10 @@ router = APIRouter()
 async def export_crosswalk_csv(profile_id: int, db: Session = Depends(DuckDBClient.get_duckdb)):
     """Export crosswalk as CSV"""
     try:
-        csv_content = ExportService.export_crosswalk_csv(db, profile_id)
+        csv_lines = ExportService.iter_crosswalk_csv(db, profile_id)
         
         return StreamingResponse(
-            StringIO(csv_content),
+            csv_lines,
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=crosswalk_{profile_id}.csv"}
         )
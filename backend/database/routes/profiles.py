@@ -4,9 +4,12 @@ FastAPI routes for profile management.
 
 import logging
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 import json
+import orjson
 
 from database.duckdb_cxn import DuckDBClient
 # and use DuckDBClient.get_duckdb as your dependency
@@ -98,16 +101,18 @@ async def ingest_file(
         # Clear existing source columns
         db.query(SourceColumn).filter(SourceColumn.profile_id == profile_id).delete()
         
-        # Create source columns
+        # Create source columns in one executemany rather than a flush per row
+        rows = []
         for col_name in column_names:
             col_info = column_data.get(col_name, {})
-            source_column = SourceColumn(
-                profile_id=profile_id,
-                source_column=col_name,
-                sample_values_json=json.dumps(col_info.get('sample_values', [])),
-                inferred_type=col_info.get('inferred_type', 'string')
-            )
-            db.add(source_column)
+            rows.append({
+                "profile_id": profile_id,
+                "source_column": col_name,
+                "sample_values_json": json.dumps(col_info.get('sample_values', [])),
+                "inferred_type": col_info.get('inferred_type', 'string')
+            })
+        if rows:
+            db.execute(insert(SourceColumn), rows)
         
         # Update profile
         profile.has_physical_file = True
@@ -144,14 +149,14 @@ async def ingest_schema(
         db.query(SourceColumn).filter(SourceColumn.profile_id == profile_id).delete()
         
         # Create source columns (without sample data)
-        for col_name in column_names:
-            source_column = SourceColumn(
-                profile_id=profile_id,
-                source_column=col_name.strip(),
-                sample_values_json=json.dumps([]),
-                inferred_type='string'
-            )
-            db.add(source_column)
+        rows = [{
+            "profile_id": profile_id,
+            "source_column": col_name.strip(),
+            "sample_values_json": "[]",
+            "inferred_type": 'string'
+        } for col_name in column_names]
+        if rows:
+            db.execute(insert(SourceColumn), rows)
         
         profile.has_physical_file = False
         
@@ -175,12 +180,14 @@ async def get_source_columns(profile_id: int, db: Session = Depends(DuckDBClient
     
     columns = db.query(SourceColumn).filter(SourceColumn.profile_id == profile_id).all()
     
-    return [{
+    # sample_values_json is already JSON text, so splice it into the response
+    # as a raw fragment instead of parsing it only to re-encode it
+    return ORJSONResponse([{
         "id": col.id,
         "source_column": col.source_column,
-        "sample_values": json.loads(col.sample_values_json or "[]"),
+        "sample_values": orjson.Fragment(col.sample_values_json) if col.sample_values_json else [],
         "inferred_type": col.inferred_type
-    } for col in columns]
+    } for col in columns])
 
 @router.get("/data-model-fields")
 async def get_data_model_fields(db: Session = Depends(DuckDBClient.get_duckdb)):
@@ -2,21 +2,23 @@
 Snowflake SQL Export API - Generate CREATE TABLE and INSERT statements
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
+from cachetools import TTLCache
+import base64
+import gzip
+import itertools
 import json
+import re
+import threading
 from datetime import datetime
-
-# Import database dependency
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functools import lru_cache
 
 from database.duckdb_cxn import DuckDBClient
-get_db = DuckDBClient.get_duckdb
 
 router = APIRouter(prefix="/api/snowflake", tags=["snowflake"])
 
@@ -27,10 +29,113 @@ class SnowflakeExport(BaseModel):
     table_name: str
     created_by: Optional[str] = None
 
+class ExportSummary(BaseModel):
+    id: int
+    client_id: str
+    file_group: Optional[str] = None
+    export_type: str
+    table_name: str
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    is_deployed: Optional[bool] = None
+
+# Statements are built once at import so each request reuses the same
+# TextClause and hits SQLAlchemy's compiled cache.
+# No completion_status filter for now - include all non-skipped records.
+# Skipped rows are dropped here, so the generators never see them.
+# Only the columns the generators read are selected
+_MAPPINGS_QUERY = """
+    SELECT ct.source_column_name, ct.source_column_order, ct.client_id, ct.file_group_name,
+    ct.mcdm_column_name, ct.in_model, ct.custom_data_type, ct.inferred_data_type,
+    ct.custom_field_type, ct.data_profile_info, ct.source_column_formatting,
+    ct.mcs_review_required, ct.provider_file_group, ct.version_notes,
+    dm.column_type as model_data_type
+    FROM crosswalk_template ct
+    LEFT JOIN pi20_data_model dm ON ct.mcdm_column_name = dm.column_name
+    WHERE ct.client_id = :client_id
+    {file_group_filter}
+    AND (ct.skipped_flag IS NULL OR ct.skipped_flag = FALSE) ORDER BY ct.source_column_order
+"""
+_MAPPINGS_SQL = text(_MAPPINGS_QUERY.format(file_group_filter="")).execution_options(yield_per=1000)
+_MAPPINGS_BY_FILE_GROUP_SQL = text(
+    _MAPPINGS_QUERY.format(file_group_filter="AND ct.file_group_name = :file_group")
+).execution_options(yield_per=1000)
+
+# Cheap change detector for a client's mappings: any insert, delete or update
+# (which bumps updated_at) changes the count or the latest timestamp
+_MAPPINGS_FINGERPRINT_QUERY = """
+    SELECT COUNT(*), MAX(updated_at) FROM crosswalk_template
+    WHERE client_id = :client_id {file_group_filter}
+"""
+_MAPPINGS_FINGERPRINT_SQL = text(_MAPPINGS_FINGERPRINT_QUERY.format(file_group_filter=""))
+_MAPPINGS_FINGERPRINT_BY_FILE_GROUP_SQL = text(
+    _MAPPINGS_FINGERPRINT_QUERY.format(file_group_filter="AND file_group_name = :file_group")
+)
+
+# Generated /generate-sql scripts keyed by request and mapping fingerprint, so an
+# unchanged crosswalk is not regenerated; every call still saves its own export.
+# Scripts are cached with this placeholder in their "Generated at" header and
+# stamped with the export's own created_at when saved
+_GENERATED_AT_PLACEHOLDER = "{generated_at}"
+_GENERATED_SQL_CACHE_TTL = 600
+_generated_sql_cache = TTLCache(maxsize=32, ttl=_GENERATED_SQL_CACHE_TTL)
+# The route runs on the threadpool and TTLCache is not thread-safe
+_generated_sql_cache_lock = threading.Lock()
+
+_INSERT_EXPORT_SQL = text("""
+    INSERT INTO snowflake_sql_exports 
+    (client_id, file_group, export_type, sql_content, table_name, created_by, created_at)
+    VALUES (:client_id, :file_group, :export_type, :sql_content, :table_name, :created_by, :created_at)
+    RETURNING id, created_at
+""")
+
+def _exports_sql(by_client: bool, by_export_type: bool):
+    """Build the /exports list statement for one combination of filters"""
+    # sql_content is left out: it can be megabytes and the list never returns it
+    query = """
+        SELECT id, client_id, file_group, export_type, table_name, created_by, created_at, is_deployed
+        FROM snowflake_sql_exports WHERE 1=1
+    """
+    if by_client:
+        query += " AND client_id = :client_id"
+    if by_export_type:
+        query += " AND export_type = :export_type"
+    query += " ORDER BY created_at DESC LIMIT :limit OFFSET :offset"
+    return text(query)
+
+_EXPORTS_SQL = {
+    (by_client, by_export_type): _exports_sql(by_client, by_export_type)
+    for by_client in (False, True)
+    for by_export_type in (False, True)
+}
+
+_EXPORT_SQL_CONTENT_SQL = text("SELECT sql_content FROM snowflake_sql_exports WHERE id = :id")
+
+# Saved scripts are repetitive and compress ~10x; the base64 payload keeps the
+# TEXT column, and the prefix tells it apart from exports saved uncompressed
+_GZIP_PREFIX = "gzip:"
+
+def _compress_sql(sql_content: str) -> str:
+    """Encode a generated script for storage in snowflake_sql_exports.sql_content"""
+    payload = gzip.compress(sql_content.encode("utf-8"), compresslevel=6)
+    return _GZIP_PREFIX + base64.b64encode(payload).decode("ascii")
+
+def _decompress_sql(stored: str) -> str:
+    """Decode snowflake_sql_exports.sql_content, compressed or saved before compression"""
+    if not stored.startswith(_GZIP_PREFIX):
+        return stored
+    return gzip.decompress(base64.b64decode(stored[len(_GZIP_PREFIX):])).decode("utf-8")
+
+def _export_location(export_id: int) -> str:
+    """URL the SQL of a saved export is served from"""
+    return f"/api/snowflake/exports/{export_id}/sql"
+
 @router.post("/generate-sql")
-async def generate_snowflake_sql(
+def generate_snowflake_sql(
     export_request: SnowflakeExport,
-    db: Session = Depends(get_db)
+    response: Response,
+    stream: bool = Query(False),
+    db: Session = Depends(DuckDBClient.get_duckdb)
 ):
     """Generate Snowflake SQL based on crosswalk mappings"""
     
@@ -42,89 +147,140 @@ async def generate_snowflake_sql(
     
     try:
         # Get crosswalk mappings
-        query = """
-            SELECT ct.*,
-            dm.column_type as model_data_type
-            FROM crosswalk_template ct
-            LEFT JOIN pi20_data_model dm ON ct.mcdm_column_name = dm.column_name
-            WHERE ct.client_id = :client_id
-        """
         params = {'client_id': export_request.client_id}
-        
         if export_request.file_group:
-            query += " AND ct.file_group_name = :file_group"
             params['file_group'] = export_request.file_group
+            query = _MAPPINGS_BY_FILE_GROUP_SQL
+            fingerprint_query = _MAPPINGS_FINGERPRINT_BY_FILE_GROUP_SQL
+        else:
+            query = _MAPPINGS_SQL
+            fingerprint_query = _MAPPINGS_FINGERPRINT_SQL
         
-        # Remove the restrictive completion_status filter for now - include all non-skipped records
-        query += " AND (ct.skipped_flag IS NULL OR ct.skipped_flag = FALSE) ORDER BY ct.source_column_order"
+        cache_key = cached = None
+        if not stream:
+            cache_key = (
+                export_request.client_id, export_request.file_group,
+                export_request.export_type, export_request.table_name,
+                *db.execute(fingerprint_query, params).one()
+            )
+            with _generated_sql_cache_lock:
+                cached = _generated_sql_cache.get(cache_key)
         
-        print(f"Executing query: {query}")
-        print(f"Query parameters: {params}")
+        if cached is not None:
+            print("Mappings unchanged since last export - reusing generated SQL")
+            sql_template, mapping_count = cached
+        else:
+            print(f"Executing query: {query}")
+            print(f"Query parameters: {params}")
         
-        mappings = db.execute(text(query), params).fetchall()
-        print(f"Found {len(mappings)} mappings")
+            # Rows arrive in batches of 1000 and the generators consume them in
+            # one pass, so the full mapping set is never held as Row objects
+            result = db.execute(query, params)
+            first_mapping = result.fetchone()
         
-        if not mappings:
-            error_msg = f"No mappings found for client_id='{export_request.client_id}'"
-            if export_request.file_group:
-                error_msg += f" and file_group='{export_request.file_group}'"
-            print(f"Error: {error_msg}")
-            raise HTTPException(status_code=404, detail=error_msg)
+            if first_mapping is None:
+                error_msg = f"No mappings found for client_id='{export_request.client_id}'"
+                if export_request.file_group:
+                    error_msg += f" and file_group='{export_request.file_group}'"
+                print(f"Error: {error_msg}")
+                raise HTTPException(status_code=404, detail=error_msg)
         
-        print(f"Generating SQL for export_type: {export_request.export_type}")
+            mapping_count = 0
         
-        # Generate SQL based on export type
-        print(f"Checking if '{export_request.export_type}' == 'CREATE_TABLE': {export_request.export_type == 'CREATE_TABLE'}")
-        print(f"Checking if '{export_request.export_type}' == 'INSERT_MAPPING': {export_request.export_type == 'INSERT_MAPPING'}")
-        print(f"Checking if '{export_request.export_type}' == 'FULL_ETL': {export_request.export_type == 'FULL_ETL'}")
+            def each_mapping():
+                nonlocal mapping_count
+                for mapping in itertools.chain((first_mapping,), result):
+                    mapping_count += 1
+                    yield mapping
         
-        if export_request.export_type == "CREATE_TABLE":
-            print("✅ MATCHED CREATE_TABLE - Calling generate_create_table_sql function")
-            sql_content = generate_create_table_sql(mappings, export_request.table_name)
-            print(f"CREATE_TABLE SQL generated, starts with: {sql_content[:100]}...")
-        elif export_request.export_type == "INSERT_MAPPING":
-            print("✅ MATCHED INSERT_MAPPING - Calling generate_insert_mapping_sql function")
-            sql_content = generate_insert_mapping_sql(mappings, export_request.table_name)
-            print(f"INSERT_MAPPING SQL generated, starts with: {sql_content[:100]}...")
-        elif export_request.export_type == "FULL_ETL":
-            print("✅ MATCHED FULL_ETL - Calling generate_full_etl_sql function")
-            sql_content = generate_full_etl_sql(mappings, export_request.table_name, export_request.client_id)
-            print(f"FULL_ETL SQL generated, starts with: {sql_content[:100]}...")
-        else:
-            print(f"❌ NO MATCH - Invalid export type: '{export_request.export_type}'")
-            raise HTTPException(status_code=400, detail=f"Invalid export type: {export_request.export_type}")
+            mappings = each_mapping()
+            if stream:
+                # The response body is produced after this handler returns, when the
+                # request session may already be closed, so fetch the rows up front
+                mappings = list(mappings)
         
-        print(f"Generated SQL content length: {len(sql_content)} characters")
+            print(f"Generating SQL for export_type: {export_request.export_type}")
+            # Streamed scripts are never saved, so they take the current time directly
+            generated_at = None if stream else _GENERATED_AT_PLACEHOLDER
+        
+            # Generate SQL based on export type
+            print(f"Checking if '{export_request.export_type}' == 'CREATE_TABLE': {export_request.export_type == 'CREATE_TABLE'}")
+            print(f"Checking if '{export_request.export_type}' == 'INSERT_MAPPING': {export_request.export_type == 'INSERT_MAPPING'}")
+            print(f"Checking if '{export_request.export_type}' == 'FULL_ETL': {export_request.export_type == 'FULL_ETL'}")
+        
+            if export_request.export_type == "CREATE_TABLE":
+                print("✅ MATCHED CREATE_TABLE - Calling iter_create_table_sql function")
+                sql_lines = iter_create_table_sql(mappings, export_request.table_name, generated_at)
+            elif export_request.export_type == "INSERT_MAPPING":
+                print("✅ MATCHED INSERT_MAPPING - Calling iter_insert_mapping_sql function")
+                sql_lines = iter_insert_mapping_sql(mappings, export_request.table_name, generated_at)
+            elif export_request.export_type == "FULL_ETL":
+                print("✅ MATCHED FULL_ETL - Calling iter_full_etl_sql function")
+                sql_lines = iter_full_etl_sql(
+                    mappings, export_request.table_name, export_request.client_id, generated_at
+                )
+            else:
+                print(f"❌ NO MATCH - Invalid export type: '{export_request.export_type}'")
+                raise HTTPException(status_code=400, detail=f"Invalid export type: {export_request.export_type}")
+        
+            if stream:
+                # Lines go to the client as they are generated; nothing is buffered or saved
+                return StreamingResponse(
+                    (line + "\n" for line in sql_lines), media_type="text/plain"
+                )
+        
+            # Join straight from the generator so only the final string is held
+            sql_template = "\n".join(sql_lines)
+            print(f"Found {mapping_count} mappings")
+            print(f"{export_request.export_type} SQL generated, starts with: {sql_template[:100]}...")
+            print(f"Generated SQL content length: {len(sql_template)} characters")
+            
+            with _generated_sql_cache_lock:
+                _generated_sql_cache[cache_key] = (sql_template, mapping_count)
+        
+        # Only the header line is stamped; mapping text that happens to contain
+        # the placeholder is left alone
+        generated_at = datetime.now()
+        sql_content = sql_template.replace(
+            f"-- Generated at: {_GENERATED_AT_PLACEHOLDER}", f"-- Generated at: {generated_at.isoformat()}", 1
+        )
         
         # Save export to database
+        export_id = created_at = None
         try:
-            db.execute(text("""
-                INSERT INTO snowflake_sql_exports 
-                (client_id, file_group, export_type, sql_content, table_name, created_by)
-                VALUES (:client_id, :file_group, :export_type, :sql_content, :table_name, :created_by)
-            """), {
+            export_id, created_at = db.execute(_INSERT_EXPORT_SQL, {
                 'client_id': export_request.client_id,
                 'file_group': export_request.file_group,
                 'export_type': export_request.export_type,
-                'sql_content': sql_content,
+                'sql_content': _compress_sql(sql_content),
                 'table_name': export_request.table_name,
-                'created_by': export_request.created_by or 'SYSTEM'
-            })
+                'created_by': export_request.created_by or 'SYSTEM',
+                'created_at': generated_at
+            }).one()
             
             db.commit()
             print("Successfully saved export to database")
             
         except Exception as save_error:
+            # Roll back so the pooled connection isn't handed out mid-failed-transaction
+            db.rollback()
+            export_id = created_at = None
             print(f"Warning: Failed to save export to database: {save_error}")
             # Continue anyway - the main functionality (SQL generation) worked
         
         result = {
+            'export_id': export_id,
+            'created_at': created_at,
             'sql_content': sql_content,
             'table_name': export_request.table_name,
             'export_type': export_request.export_type,
-            'mapping_count': len(mappings)
+            'mapping_count': mapping_count
         }
         
+        if export_id is not None:
+            response.status_code = 201
+            response.headers["Location"] = _export_location(export_id)
+        
         print(f"Snowflake SQL generation completed successfully")
         return result
         
@@ -138,299 +294,268 @@ async def generate_snowflake_sql(
         print(f"Full traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def generate_create_table_sql(mappings, table_name):
+# One case-insensitive pass finds the type marker; NUMBER is absent from the
+# map because it keeps an explicit precision when one is given
+_TYPE_RE = re.compile(r"VARCHAR|NUMBER|TIMESTAMP|DATE|BOOLEAN", re.IGNORECASE)
+_SNOWFLAKE_TYPES = {
+    "VARCHAR": "STRING",
+    "DATE": "DATE",
+    "TIMESTAMP": "TIMESTAMP_NTZ",
+    "BOOLEAN": "BOOLEAN",
+}
+
+_ESCAPE_QUOTES = str.maketrans({"'": "''"})
+# The profile description sits inside a triple double-quoted block, where only
+# a double quote can close it early; single quotes are left as written
+_ESCAPE_DOUBLE_QUOTES = str.maketrans({'"': '""'})
+
+@lru_cache(maxsize=256)
+def _snowflake_type(data_type: str) -> str:
+    """Map a crosswalk/data model type to the Snowflake column type"""
+    match = _TYPE_RE.search(data_type)
+    if not match:
+        return "STRING"
+    marker = match.group().upper()
+    if marker == "NUMBER":
+        return data_type if "," in data_type else "NUMBER(38,0)"
+    return _SNOWFLAKE_TYPES[marker]
+
+def _data_type(row) -> str:
+    """Source type for a mapping: custom, then inferred, then the data model's"""
+    return row['custom_data_type'] or row['inferred_data_type'] or row['model_data_type'] or "VARCHAR(255)"
+
+def _sql_text(value) -> str:
+    """Body of a single-quoted SQL literal: empty for NULL, embedded quotes doubled"""
+    return (value or "").translate(_ESCAPE_QUOTES)
+
+def _column_comment(row) -> str:
+    """COMMENT clause for a mapping's profile info, quote-escaped and capped at 255 chars"""
+    if not row['data_profile_info']:
+        return ""
+    return f" COMMENT '{row['data_profile_info'].translate(_ESCAPE_QUOTES)[:255]}'"
+
+# Script headers are formatted with the generation timestamp and table name;
+# callers may pass a fixed generated_at to get reproducible output
+_CREATE_TABLE_HEADER = """-- Snowflake CREATE TABLE generated from crosswalk mappings
+-- Generated at: {generated_at}
+
+CREATE OR REPLACE TABLE {table_name} ("""
+
+_INSERT_MAPPING_HEADER = """-- Crosswalk INSERT VALUES - Exact Excel Formula Logic
+-- Generated at: {generated_at}
+-- This matches your Excel =IF(A3=...) formula for 'Output DML for Crosswalk'
+
+INSERT INTO {table_name} VALUES"""
+
+_FULL_ETL_HEADER = """-- Complete ETL SQL generated from crosswalk mappings
+-- Client: {client_id}
+-- Generated at: {generated_at}
+
+CREATE OR REPLACE VIEW {table_name}_ETL AS
+WITH"""
+
+def generate_create_table_sql(mappings, table_name, generated_at=None):
     """Generate CREATE TABLE SQL for Snowflake"""
+    return "\n".join(iter_create_table_sql(mappings, table_name, generated_at))
+
+def iter_create_table_sql(mappings, table_name, generated_at=None):
+    """Yield the Snowflake CREATE TABLE script line by line"""
     
-    print(f"generate_create_table_sql called with {len(mappings)} mappings for table: {table_name}")
-    
-    sql_lines = [
-        f"-- Snowflake CREATE TABLE generated from crosswalk mappings",
-        f"-- Generated at: {datetime.now().isoformat()}",
-        f"",
-        f"CREATE OR REPLACE TABLE {table_name} (",
-    ]
+    print(f"iter_create_table_sql called for table: {table_name}")
     
+    # Single pass so mappings may be a streaming result; plain mapping access
+    # is cheaper than Row attribute lookup in the per-column path
+    client_id = None
     column_definitions = []
-    
-    for i, mapping in enumerate(mappings):
-        print(f"Processing mapping {i}: mcdm_column_name='{mapping.mcdm_column_name}', skipped_flag={mapping.skipped_flag}")
-        
-        if not mapping.mcdm_column_name or mapping.skipped_flag:
-            print(f"Skipping mapping {i}: missing column name or skipped")
-            continue
-            
-        # Determine data type
-        data_type = mapping.custom_data_type or mapping.inferred_data_type or mapping.model_data_type or "VARCHAR(255)"
-        print(f"Data type for {mapping.mcdm_column_name}: {data_type}")
-        
-        # Map to Snowflake types
-        if "VARCHAR" in data_type.upper():
-            snowflake_type = "STRING"
-        elif "NUMBER" in data_type.upper():
-            if "," in data_type:
-                snowflake_type = data_type.replace("NUMBER", "NUMBER")
-            else:
-                snowflake_type = "NUMBER(38,0)"
-        elif "DATE" in data_type.upper():
-            snowflake_type = "DATE"
-        elif "TIMESTAMP" in data_type.upper():
-            snowflake_type = "TIMESTAMP_NTZ"
-        elif "BOOLEAN" in data_type.upper():
-            snowflake_type = "BOOLEAN"
-        else:
-            snowflake_type = "STRING"
-        
-        # Add column definition
-        column_def = f"    {mapping.mcdm_column_name} {snowflake_type}"
-        
-        # Add comment if available
-        if mapping.data_profile_info:
-            comment = mapping.data_profile_info.replace("'", "''")[:255]  # Escape quotes and limit length
-            column_def += f" COMMENT '{comment}'"
-        
-        column_definitions.append(column_def)
+    for mapping in mappings:
+        row = mapping._mapping
+        if client_id is None:
+            client_id = row['client_id']
+        if row['mcdm_column_name']:
+            column_definitions.append(
+                f"    {row['mcdm_column_name']} {_snowflake_type(_data_type(row))}{_column_comment(row)}"
+            )
     
     print(f"Generated {len(column_definitions)} column definitions")
     
     if not column_definitions:
         print("WARNING: No valid column definitions found!")
-        return f"-- No valid columns found for table {table_name}"
+        yield f"-- No valid columns found for table {table_name}"
+        return
+    
+    yield _CREATE_TABLE_HEADER.format(
+        generated_at=generated_at or datetime.now().isoformat(), table_name=table_name
+    )
     
     # Join columns with commas
-    sql_lines.extend([",\n".join(column_definitions)])
-    sql_lines.append(");")
+    yield ",\n".join(column_definitions)
+    yield ");"
     
     # Add table comment
-    sql_lines.extend([
-        "",
-        f"COMMENT ON TABLE {table_name} IS 'Auto-generated from crosswalk mappings - Client: {mappings[0].client_id}';",
-        ""
-    ])
-    
-    final_sql = "\n".join(sql_lines)
-    print(f"Final CREATE TABLE SQL length: {len(final_sql)} characters")
-    return final_sql
+    yield ""
+    yield f"COMMENT ON TABLE {table_name} IS 'Auto-generated from crosswalk mappings - Client: {client_id}';"
+    yield ""
 
-def generate_insert_mapping_sql(mappings, table_name):
+def generate_insert_mapping_sql(mappings, table_name, generated_at=None):
     """Generate INSERT VALUES exactly matching the Excel formula logic for crosswalk configuration"""
+    return "\n".join(iter_insert_mapping_sql(mappings, table_name, generated_at))
+
+def iter_insert_mapping_sql(mappings, table_name, generated_at=None):
+    """Yield the crosswalk INSERT VALUES script line by line"""
     
-    sql_lines = [
-        f"-- Crosswalk INSERT VALUES - Exact Excel Formula Logic",
-        f"-- Generated at: {datetime.now().isoformat()}",
-        f"-- This matches your Excel =IF(A3=...) formula for 'Output DML for Crosswalk'",
-        f"",
-        f"INSERT INTO {table_name} VALUES"
-    ]
+    yield _INSERT_MAPPING_HEADER.format(
+        generated_at=generated_at or datetime.now().isoformat(), table_name=table_name
+    )
     
-    value_clauses = []
+    # Each clause is held back one row so the last one can be emitted without a comma
+    previous_clause = None
+    clause_count = 0
     
     for mapping in mappings:
+        row = mapping._mapping
         # Excel formula: IF(A3="","", ...)
-        A3 = mapping.source_column_name or ""  # Source column name
+        A3 = _sql_text(row['source_column_name'])  # Source column name
         if A3 == "":
             continue  # Skip empty rows like Excel
         
         # Map database fields to Excel columns based on your formula
-        B3 = mapping.source_column_order if mapping.source_column_order is not None else "NULL"  # Source column order (number)
-        C3 = mapping.data_profile_info or ""  # Description (gets double quoted)
-        D3 = mapping.client_id or ""  # Client ID
-        E3 = mapping.in_model or ""  # MCDM table or status
-        F3 = mapping.in_model or ""  # in_model flag
-        G3 = mapping.mcdm_column_name or ""  # MCDM column name
-        H3 = mapping.custom_field_type or ""  # Custom field type
+        B3 = row['source_column_order'] if row['source_column_order'] is not None else "NULL"  # Source column order (number)
+        C3 = (row['data_profile_info'] or "").translate(_ESCAPE_DOUBLE_QUOTES)  # Description (gets double quoted)
+        D3 = _sql_text(row['client_id'])  # Client ID
+        E3 = _sql_text(row['in_model'])  # MCDM table or status
+        F3 = row['in_model'] or ""  # in_model flag
+        G3 = _sql_text(row['mcdm_column_name'])  # MCDM column name
+        H3 = _sql_text(row['custom_field_type'])  # Custom field type
         N3 = "NULL"  # Some numeric field (placeholder)
-        O3 = mapping.mcs_review_required or False  # Boolean field
-        P3 = mapping.mcs_review_required or False  # Boolean field (reusing for now)
-        R3 = mapping.source_column_formatting or ""  # Additional field
-        S3 = mapping.provider_file_group or ""  # Additional field
-        T3 = mapping.version_notes or ""  # Additional field
+        O3 = row['mcs_review_required'] or False  # Boolean field
+        P3 = row['mcs_review_required'] or False  # Boolean field (reusing for now)
+        R3 = _sql_text(row['source_column_formatting'])  # Additional field
+        S3 = _sql_text(row['provider_file_group'])  # Additional field
+        T3 = _sql_text(row['version_notes'])  # Additional field
+        
+        # Fragments shared by both formats
+        p3_val = "TRUE" if P3 else "NULL"  # IF(P3=TRUE,"TRUE","NULL")
+        o3_val = "TRUE" if O3 else "NULL"  # IF(O3=TRUE,"TRUE","NULL")
+        s3_val = "NULL" if S3 == "" else f"'{S3}'"  # IF(S3="","NULL","'"&S3&"'")
+        t3_val = "NULL" if T3 == "" else f"'{T3}'"  # IF(T3="","NULL","'"&T3&"'")
         
         # Excel logic: IF(E3="NOT USED", [first format], [second format])
         if E3 == "NOT USED":
             # First format: (A3, D3, B3, C3, NULL,NULL,NULL,NULL,NULL, P3, O3, S3, T3)
-            s3_val = "NULL" if S3 == "" else f"'{S3}'"
-            t3_val = "NULL" if T3 == "" else f"'{T3}'"
-            value_clause = f"('{A3}','{D3}',{B3},\"\"\"{C3}\"\"\",NULL,NULL,NULL,NULL,NULL,"
-            value_clause += f"{'TRUE' if P3 else 'NULL'},"
-            value_clause += f"{'TRUE' if O3 else 'NULL'},"
-            value_clause += f"{s3_val},"
-            value_clause += f"{t3_val})"
+            value_clause = (
+                f"('{A3}','{D3}',{B3},\"\"\"{C3}\"\"\",NULL,NULL,NULL,NULL,NULL,"
+                f"{p3_val},{o3_val},{s3_val},{t3_val})"
+            )
         else:
             # Main format matching your Excel formula exactly
-            value_clause = f"('{A3}',"
-            
-            # IF(ISBLANK(D3),"NULL","'"&D3&"'")
-            d3_val = "NULL" if D3 == "" else f"'{D3}'"
-            value_clause += f"{d3_val},"
-            
-            # IF(ISBLANK(B3),"NULL",B3)  
-            value_clause += f"{'NULL' if B3 == 'NULL' else B3},"
-            
-            # IF(ISBLANK(C3),"NULL","'"""&C3&"""'")
-            c3_val = "NULL" if C3 == "" else f'"""{C3}"""'
-            value_clause += f"{c3_val},"
-            
-            # G3 (MCDM column)
-            value_clause += f"'{G3}',"
-            
-            # E3 (MCDM table/status)
-            value_clause += f"'{E3}',"
-            
-            # IF(N3="","NULL",N3)
-            value_clause += f"{N3},"
-            
-            # IF(F3="Y","NULL","'"&H3&"'")
-            h3_val = "NULL" if F3 == "Y" else f"'{H3}'"
-            value_clause += f"{h3_val},"
-            
-            # IF(R3="","NULL","'"&R3&"'")
-            r3_val = "NULL" if R3 == "" else f"'{R3}'"
-            value_clause += f"{r3_val},"
-            
-            # IF(P3=TRUE,"TRUE","NULL")
-            value_clause += f"{'TRUE' if P3 else 'NULL'},"
-            
-            # IF(O3=TRUE,"TRUE","NULL")  
-            value_clause += f"{'TRUE' if O3 else 'NULL'},"
-            
-            # IF(S3="","NULL","'"&S3&"'")
-            s3_val = "NULL" if S3 == "" else f"'{S3}'"
-            value_clause += f"{s3_val},"
-            
-            # IF(T3="","NULL","'"&T3&"'")
-            t3_val = "NULL" if T3 == "" else f"'{T3}'"
-            value_clause += f"{t3_val})"
+            d3_val = "NULL" if D3 == "" else f"'{D3}'"  # IF(ISBLANK(D3),"NULL","'"&D3&"'")
+            c3_val = "NULL" if C3 == "" else f'"""{C3}"""'  # IF(ISBLANK(C3),"NULL","'"""&C3&"""'")
+            h3_val = "NULL" if F3 == "Y" else f"'{H3}'"  # IF(F3="Y","NULL","'"&H3&"'")
+            r3_val = "NULL" if R3 == "" else f"'{R3}'"  # IF(R3="","NULL","'"&R3&"'")
+            # B3 is already "NULL" when blank; G3 is the MCDM column, E3 the MCDM table/status
+            value_clause = (
+                f"('{A3}',{d3_val},{B3},{c3_val},'{G3}','{E3}',{N3},"
+                f"{h3_val},{r3_val},{p3_val},{o3_val},{s3_val},{t3_val})"
+            )
         
-        value_clauses.append(value_clause)
-    
-    # Join all VALUE clauses with commas (like dragging down Excel formula)
-    if value_clauses:
-        sql_lines.extend([",\n".join(value_clauses)])
-        sql_lines.append(";")
-        sql_lines.append("")
-        sql_lines.append(f"-- {len(value_clauses)} crosswalk mappings generated")
-        sql_lines.append("-- Each row matches your Excel formula: =IF(A3=\"\",...)")
+        # Separate VALUE clauses with commas (like dragging down Excel formula)
+        if previous_clause is not None:
+            yield previous_clause + ","
+        previous_clause = value_clause
+        clause_count += 1
+    
+    if previous_clause is not None:
+        yield previous_clause
+        yield ";"
+        yield ""
+        yield f"-- {clause_count} crosswalk mappings generated"
+        yield "-- Each row matches your Excel formula: =IF(A3=\"\",...)"
     else:
-        sql_lines.append("-- No valid mappings found")
-    
-    return "\n".join(sql_lines)
+        yield "-- No valid mappings found"
 
-def generate_full_etl_sql(mappings, table_name, client_id):
+def generate_full_etl_sql(mappings, table_name, client_id, generated_at=None):
     """Generate complete ETL SQL with joins and transformations"""
+    return "\n".join(iter_full_etl_sql(mappings, table_name, client_id, generated_at))
+
+def iter_full_etl_sql(mappings, table_name, client_id, generated_at=None):
+    """Yield the complete ETL view script line by line"""
     
     # Group mappings by source file/table
     file_groups = {}
     for mapping in mappings:
-        if mapping.skipped_flag:
-            continue
-        fg = mapping.file_group_name or 'DEFAULT'
+        row = mapping._mapping
+        fg = row['file_group_name'] or 'DEFAULT'
         if fg not in file_groups:
             file_groups[fg] = []
-        file_groups[fg].append(mapping)
+        file_groups[fg].append(row)
     
-    sql_lines = [
-        f"-- Complete ETL SQL generated from crosswalk mappings",
-        f"-- Client: {client_id}",
-        f"-- Generated at: {datetime.now().isoformat()}",
-        f"",
-        f"CREATE OR REPLACE VIEW {table_name}_ETL AS",
-        f"WITH"
-    ]
+    yield _FULL_ETL_HEADER.format(
+        client_id=client_id, generated_at=generated_at or datetime.now().isoformat(), table_name=table_name
+    )
     
-    # Build CTEs for each file group
-    cte_lines = []
+    # Build CTEs for each file group, comma-separated
     for i, (fg, group_mappings) in enumerate(file_groups.items()):
+        if i:
+            yield ","
         cte_name = f"{fg.lower()}_data"
-        cte_lines.append(f"{cte_name} AS (")
-        cte_lines.append("  SELECT")
-        
-        select_items = []
-        for mapping in group_mappings:
-            if not mapping.mcdm_column_name:
-                continue
-                
-            source_col = mapping.source_column_name
-            if mapping.source_column_formatting:
-                expr = mapping.source_column_formatting
-            else:
-                expr = source_col
-            
-            select_items.append(f"    {expr} AS {mapping.mcdm_column_name}")
-        
-        cte_lines.extend([",\n".join(select_items)])
-        cte_lines.append(f"  FROM raw.{fg.lower()}_table")  # Placeholder table name
-        cte_lines.append(")")
+        yield f"{cte_name} AS ("
+        yield "  SELECT"
         
-        if i < len(file_groups) - 1:
-            cte_lines.append(",")
-    
-    sql_lines.extend(cte_lines)
+        # The formatting expression, when given, replaces the bare source column
+        yield ",\n".join(
+            f"    {row['source_column_formatting'] or row['source_column_name']} AS {row['mcdm_column_name']}"
+            for row in group_mappings
+            if row['mcdm_column_name']
+        )
+        yield f"  FROM raw.{fg.lower()}_table"  # Placeholder table name
+        yield ")"
+    
+    fg_names = list(file_groups)
+    base = f"{fg_names[0].lower()}_data"
     
     # Main SELECT with joins
-    sql_lines.extend([
-        "",
-        "SELECT",
-        "  -- Add your final SELECT columns here based on target table",
-        "  *",
-        f"FROM {list(file_groups.keys())[0].lower()}_data"
-    ])
+    yield ""
+    yield "SELECT"
+    yield "  -- Add your final SELECT columns here based on target table"
+    yield "  *"
+    yield f"FROM {base}"
     
     # Add joins if multiple file groups
-    if len(file_groups) > 1:
-        for fg in list(file_groups.keys())[1:]:
-            sql_lines.append(f"LEFT JOIN {fg.lower()}_data ON {list(file_groups.keys())[0].lower()}_data.some_sid = {fg.lower()}_data.some_sid")
-    
-    sql_lines.append(";")
+    for fg in fg_names[1:]:
+        yield f"LEFT JOIN {fg.lower()}_data ON {base}.some_sid = {fg.lower()}_data.some_sid"
     
-    return "\n".join(sql_lines)
+    yield ";"
 
-@router.get("/exports")
-async def get_exports(
+@router.get("/exports", response_model=List[ExportSummary])
+def get_exports(
     client_id: Optional[str] = Query(None),
     export_type: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, le=500),
+    offset: int = Query(0),
+    db: Session = Depends(DuckDBClient.get_duckdb)
 ):
-    """Get list of Snowflake SQL exports"""
-    
-    query = "SELECT * FROM snowflake_sql_exports WHERE 1=1"
-    params = {}
+    """Get list of Snowflake SQL exports, newest first"""
     
+    params = {'limit': limit, 'offset': offset}
     if client_id:
-        query += " AND client_id = :client_id"
         params['client_id'] = client_id
-        
     if export_type:
-        query += " AND export_type = :export_type"
         params['export_type'] = export_type
     
-    query += " ORDER BY created_at DESC"
+    exports = db.execute(_EXPORTS_SQL[bool(client_id), bool(export_type)], params).mappings()
     
-    exports = db.execute(text(query), params).fetchall()
-    
-    return [
-        {
-            'id': exp[0],
-            'client_id': exp[1],
-            'file_group': exp[2],
-            'export_type': exp[3],
-            'table_name': exp[5],
-            'created_by': exp[6],
-            'created_at': exp[7],
-            'is_deployed': exp[8]
-        }
-        for exp in exports
-    ]
+    # Returning the response directly skips response_model validation; the
+    # model still documents the shape in the OpenAPI schema
+    return ORJSONResponse([dict(exp) for exp in exports])
 
 @router.get("/exports/{export_id}/sql")
-async def get_export_sql(export_id: int, db: Session = Depends(get_db)):
+def get_export_sql(export_id: int, db: Session = Depends(DuckDBClient.get_duckdb)):
     """Get SQL content for a specific export"""
     
-    result = db.execute(
-        text("SELECT sql_content FROM snowflake_sql_exports WHERE id = :id"),
-        {'id': export_id}
-    ).fetchone()
+    result = db.execute(_EXPORT_SQL_CONTENT_SQL, {'id': export_id}).fetchone()
     
     if not result:
         raise HTTPException(status_code=404, detail="Export not found")
     
-    return {'sql_content': result[0]}
\ No newline at end of file
+    # GZipMiddleware compresses the response for clients that accept it
+    return {'sql_content': _decompress_sql(result[0] or "")}
\ No newline at end of file
@@ -15,6 +15,7 @@ import duckdb
 import re
 import json
 import os
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from fuzzywuzzy import fuzz, process
@@ -23,6 +24,14 @@ import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+# Separators stripped before comparing column names
+_NAME_SEPARATORS = re.compile(r'[_\s-]+')
+
+@lru_cache(maxsize=2048)
+def _compile(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a regex once per (pattern, flags) and reuse it across calls"""
+    return re.compile(pattern, flags)
+
 @dataclass
 class MappingSuggestion:
     """Represents a mapping suggestion with confidence score"""
@@ -89,14 +98,20 @@ class AutoMapper:
                 """
                 df = pd.read_sql_query(query, conn)
                 conn.close()
+                # Walk the column arrays directly rather than building a Series per row
                 self.data_model_fields = [
                 DataModelField(
-                    table=row['TABLE_NAME'],
-                    column=row['COLUMN_NAME'], 
-                    description=row['COLUMN_COMMENT'] or '',
-                    data_type=row['COLUMN_TYPE']
+                    table=table,
+                    column=column,
+                    description=comment or '',
+                    data_type=data_type
+                )
+                for table, column, comment, data_type in zip(
+                    df['TABLE_NAME'].to_numpy(dtype=object),
+                    df['COLUMN_NAME'].to_numpy(dtype=object),
+                    df['COLUMN_COMMENT'].to_numpy(dtype=object),
+                    df['COLUMN_TYPE'].to_numpy(dtype=object),
                 )
-                for _, row in df.iterrows()
             ]
                 print(f"Loaded {len(self.data_model_fields)} data model fields")
         except Exception as e:
@@ -131,12 +146,9 @@ class AutoMapper:
         clean_values = [str(v).strip() for v in sample_values if v is not None]
         
         for pattern_type, patterns in self.pattern_library.items():
-            matches = 0
-            for value in clean_values[:10]:  # Check first 10 values
-                for pattern in patterns:
-                    if re.match(pattern, str(value)):
-                        matches += 1
-                        break
+            # One alternation per type so each value is matched in a single pass
+            combined = _compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+            matches = sum(1 for value in clean_values[:10] if combined.match(value))  # Check first 10 values
             
             if clean_values:
                 pattern_scores[pattern_type] = matches / min(len(clean_values), 10)
@@ -146,8 +158,8 @@ class AutoMapper:
     def calculate_string_similarity(self, source_col: str, target_col: str) -> float:
         """Calculate string similarity between column names"""
         # Normalize column names
-        source_norm = re.sub(r'[_\s-]+', '', source_col.lower())
-        target_norm = re.sub(r'[_\s-]+', '', target_col.lower())
+        source_norm = _NAME_SEPARATORS.sub('', source_col.lower())
+        target_norm = _NAME_SEPARATORS.sub('', target_col.lower())
         
         # Use multiple similarity metrics
         ratio = fuzz.ratio(source_norm, target_norm) / 100.0
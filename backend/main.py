@@ -9,6 +9,8 @@ we ensure the backend directory itself is added to ``sys.path`` when imported
 as ``backend.app`` so those imports resolve without refactoring every module.
 """
 
+import asyncio
+import logging
 import os
 import sys
 
@@ -21,6 +23,8 @@ if _BACKEND_DIR not in sys.path:  # idempotent
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from database.duckdb_cxn import engine
@@ -28,11 +32,14 @@ from database.models import Base
 from database.routes import profiles, exports, datamodel, snowflake_export
 from database.routes import auto_mapping
 
+logger = logging.getLogger(__name__)
+
 # Create FastAPI app
 app = FastAPI(
     title="Crosswalk Aarete - Agentic Data Engineering Tool",
     description="Data engineering tool for column mapping and validation. Created by Diana Valladares.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware 
@@ -44,6 +51,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON bodies such as saved export SQL for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Include API routers
 app.include_router(profiles.router, prefix="/api")
 app.include_router(crosswalk.router, prefix="/api")
@@ -73,4 +83,17 @@ async def _print_routes():
             print(r.path, getattr(r, "methods", None))
         except Exception:
             pass
-    print("==============\n")
\ No newline at end of file
+    print("==============\n")
+
+def _log_auto_mapper_warmup(future):
+    """Report a failed AutoMapper warmup; the next request retries the build"""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("AutoMapper warmup failed", exc_info=future.exception())
+
+@app.on_event("startup")
+async def _warm_auto_mapper():
+    # Build the AutoMapper in a worker thread so startup isn't blocked on it;
+    # the future is kept on app.state so it isn't dropped unobserved
+    warmup = asyncio.get_running_loop().run_in_executor(None, auto_mapping.get_mapper)
+    warmup.add_done_callback(_log_auto_mapper_warmup)
+    app.state.auto_mapper_warmup = warmup
\ No newline at end of file
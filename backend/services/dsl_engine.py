@@ -3,7 +3,8 @@ DSL (Domain Specific Language) engine for transform expressions.
 """
 
 import re
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 @dataclass
@@ -28,11 +29,64 @@ class DSLEngine:
         'is_null': r'is_null\(([^)]+)\)'
     }
     
+    # Patterns are fixed, so compile them once instead of per call
+    FUNCTION_PATTERNS_COMPILED = {
+        name: re.compile(pattern, re.IGNORECASE) for name, pattern in FUNCTION_PATTERNS.items()
+    }
+    
+    # Loose `name(...)` matcher for every function in one pass; the lookahead
+    # lets calls overlap, so `upper(trim(x))` yields both the outer and inner call
+    _FUNCTION_CALL_PATTERN = re.compile(
+        r'(?=((?:' + '|'.join(map(re.escape, FUNCTION_PATTERNS)) + r')\([^)]*\)))', re.IGNORECASE
+    )
+    
+    # DSL function -> SQL rewrites, applied in order, each keyed by the call
+    # prefix that must appear in the expression for the rewrite to match
+    _SQL_TRANSLATIONS = [
+        (call_prefix, re.compile(pattern, re.IGNORECASE), replacement)
+        for call_prefix, pattern, replacement in (
+            ('upper(', r'upper\(([^)]+)\)', r'UPPER(\1)'),
+            ('lower(', r'lower\(([^)]+)\)', r'LOWER(\1)'),
+            ('trim(', r'trim\(([^)]+)\)', r'TRIM(\1)'),
+            ('substr(', r'substr\(([^,]+),\s*(\d+),\s*(\d+)\)', r'SUBSTR(\1, \2, \3)'),
+            ('coalesce(', r'coalesce\(([^)]+)\)', r'COALESCE(\1)'),
+            ('regex_extract(', r'regex_extract\(([^,]+),\s*[\'"]([^\'\"]+)[\'"],\s*(\d+)\)', r'REGEXP_SUBSTR(\1, \'\2\')'),
+            ('regex_replace(', r'regex_replace\(([^,]+),\s*[\'"]([^\'\"]+)[\'"],\s*[\'"]([^\'\"]*)[\'\"]\)', r'REGEXP_REPLACE(\1, \'\2\', \'\3\')'),
+            ('if(', r'if\(([^,]+),\s*([^,]+),\s*([^)]+)\)', r'CASE WHEN \1 THEN \2 ELSE \3 END'),
+            ('matches(', r'matches\(([^,]+),\s*[\'"]([^\'\"]+)[\'\"]\)', r'REGEXP_LIKE(\1, \'\2\')'),
+            ('is_null(', r'is_null\(([^)]+)\)', r'(\1 IS NULL)'),
+        )
+    ]
+    
+    _COLUMN_REF_PATTERN = re.compile(r'col\([\'"]([^\'\"]+)[\'"]\)', re.IGNORECASE)
+    
     @classmethod
     def validate_expression(cls, expression: str) -> Dict[str, Any]:
         """
         Validate a DSL expression and return validation result.
         """
+        # Rebuilt per call so callers get their own mutable containers and
+        # can't reach the memoised result
+        return {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in _validate_expression(expression)
+        }
+    
+    @classmethod
+    def translate_to_sql(cls, expression: str, column_mapping: Dict[str, str] = None) -> str:
+        """
+        Translate DSL expression to SQL.
+        
+        Args:
+            expression: DSL expression to translate
+            column_mapping: Optional mapping of source columns to SQL column references
+        """
+        # The mapping becomes an ordered tuple of items so it can key the cache
+        return _translate_to_sql(expression, tuple(column_mapping.items()) if column_mapping else None)
+    
+    @classmethod
+    def _validate_expression(cls, expression: str) -> Dict[str, Any]:
+        """Uncached validate_expression"""
         try:
             # Basic syntax validation
             if not expression.strip():
@@ -62,50 +116,46 @@ class DSLEngine:
             return {"valid": False, "message": f"Validation error: {str(e)}"}
     
     @classmethod
-    def translate_to_sql(cls, expression: str, column_mapping: Dict[str, str] = None) -> str:
-        """
-        Translate DSL expression to SQL.
-        
-        Args:
-            expression: DSL expression to translate
-            column_mapping: Optional mapping of source columns to SQL column references
-        """
+    def _translate_to_sql(cls, expression: str, column_mapping: Dict[str, str] = None) -> str:
+        """Uncached translate_to_sql"""
         if not expression.strip():
             return "NULL"
         
         sql_expr = expression
         
-        # Replace DSL functions with SQL equivalents
-        replacements = {
-            r'upper\(([^)]+)\)': r'UPPER(\1)',
-            r'lower\(([^)]+)\)': r'LOWER(\1)',
-            r'trim\(([^)]+)\)': r'TRIM(\1)',
-            r'substr\(([^,]+),\s*(\d+),\s*(\d+)\)': r'SUBSTR(\1, \2, \3)',
-            r'coalesce\(([^)]+)\)': r'COALESCE(\1)',
-            r'regex_extract\(([^,]+),\s*[\'"]([^\'\"]+)[\'"],\s*(\d+)\)': r'REGEXP_SUBSTR(\1, \'\2\')',
-            r'regex_replace\(([^,]+),\s*[\'"]([^\'\"]+)[\'"],\s*[\'"]([^\'\"]*)[\'\"]\)': r'REGEXP_REPLACE(\1, \'\2\', \'\3\')',
-            r'if\(([^,]+),\s*([^,]+),\s*([^)]+)\)': r'CASE WHEN \1 THEN \2 ELSE \3 END',
-            r'matches\(([^,]+),\s*[\'"]([^\'\"]+)[\'\"]\)': r'REGEXP_LIKE(\1, \'\2\')',
-            r'is_null\(([^)]+)\)': r'(\1 IS NULL)',
-        }
-        
-        for pattern, replacement in replacements.items():
-            sql_expr = re.sub(pattern, replacement, sql_expr, flags=re.IGNORECASE)
+        # Replace DSL functions with SQL equivalents. Rewrites stay separate
+        # ordered passes so nested calls like upper(trim(x)) translate inside
+        # out, but a pass only runs when its function is called at all. No
+        # rewrite emits another function's call prefix before that function's
+        # own pass, so testing the input once is enough.
+        folded = expression.casefold()
+        for call_prefix, pattern, replacement in cls._SQL_TRANSLATIONS:
+            if call_prefix in folded:
+                sql_expr = pattern.sub(replacement, sql_expr)
         
         # Replace column references
         if column_mapping:
+            # One scan over col('...') references, resolved case-insensitively;
+            # the first mapping wins when names differ only in case
+            sql_refs = {}
             for source_col, sql_ref in column_mapping.items():
-                col_pattern = rf'col\([\'\"]{re.escape(source_col)}[\'\"]\)'
-                sql_expr = re.sub(col_pattern, sql_ref, sql_expr, flags=re.IGNORECASE)
+                sql_refs.setdefault(source_col.lower(), sql_ref)
+            sql_expr = cls._COLUMN_REF_PATTERN.sub(
+                lambda match: sql_refs.get(match.group(1).lower(), match.group(0)), sql_expr
+            )
         else:
             # Default column reference replacement
-            sql_expr = re.sub(r'col\([\'"]([^\'\"]+)[\'"]\)', r'\1', sql_expr, flags=re.IGNORECASE)
+            sql_expr = cls._COLUMN_REF_PATTERN.sub(r'\1', sql_expr)
         
         return sql_expr
     
     @classmethod
     def _check_balanced_parentheses(cls, expression: str) -> bool:
         """Check if parentheses are balanced in the expression"""
+        # str.count runs in C; unequal totals can never balance, so only
+        # expressions that pass this check need the ordering scan below
+        if expression.count('(') != expression.count(')'):
+            return False
         count = 0
         for char in expression:
             if char == '(':
@@ -119,16 +169,27 @@ class DSLEngine:
     @classmethod
     def _extract_functions(cls, expression: str) -> List[str]:
         """Extract function calls from expression"""
-        functions = []
-        for func_name, pattern in cls.FUNCTION_PATTERNS.items():
-            matches = re.findall(f'{func_name}\\([^)]*\\)', expression, re.IGNORECASE)
-            functions.extend(matches)
-        return functions
+        return cls._FUNCTION_CALL_PATTERN.findall(expression)
     
     @classmethod
     def _validate_function_call(cls, func_call: str) -> bool:
         """Validate a specific function call"""
-        for func_name, pattern in cls.FUNCTION_PATTERNS.items():
+        for func_name, pattern in cls.FUNCTION_PATTERNS_COMPILED.items():
             if func_call.lower().startswith(func_name.lower()):
-                return bool(re.match(pattern, func_call, re.IGNORECASE))
+                return bool(pattern.match(func_call))
         return False
+
+# Both are pure functions of their inputs, and the same expressions come back
+# on every validation round-trip and export
+@lru_cache(maxsize=4096)
+def _validate_expression(expression: str) -> Tuple[Tuple[str, Any], ...]:
+    """Memoised DSLEngine._validate_expression, frozen into (key, value) pairs with lists as tuples"""
+    return tuple(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in DSLEngine._validate_expression(expression).items()
+    )
+
+@lru_cache(maxsize=4096)
+def _translate_to_sql(expression: str, column_mapping_items: Optional[Tuple[Tuple[str, str], ...]]) -> str:
+    """Memoised DSLEngine._translate_to_sql"""
+    return DSLEngine._translate_to_sql(expression, dict(column_mapping_items) if column_mapping_items else None)
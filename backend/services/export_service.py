@@ -5,42 +5,126 @@ Export service for generating various output formats.
 import json
 import csv
 from io import StringIO, BytesIO
-from typing import List, Dict, Any
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import pandas as pd
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database.models import SourceProfile, SourceColumn, CrosswalkMapping, RegexRule, DataModelField
 from services.dsl_engine import DSLEngine
 
+_CROSSWALK_EXPORT_COLUMNS = [
+    'client_id', 'source_column', 'model_table', 'model_column', 'is_custom_field',
+    'custom_field_name', 'transform_expression', 'regex_rules', 'notes'
+]
+
+# export_sql_script pieces; each ends in a blank line before the next part
+_CROSSWALK_DDL = """-- Crosswalk table creation (idempotent)
+CREATE TABLE IF NOT EXISTS crosswalk_mappings (
+    id INTEGER PRIMARY KEY,
+    client_id VARCHAR(50),
+    source_column VARCHAR(255),
+    model_table VARCHAR(100),
+    model_column VARCHAR(100),
+    is_custom_field BOOLEAN DEFAULT FALSE,
+    custom_field_name VARCHAR(255),
+    transform_expression TEXT,
+    regex_json TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(client_id, source_column)
+);
+
+-- Upsert crosswalk mappings"""
+
+_CROSSWALK_UPSERT = """INSERT OR REPLACE INTO crosswalk_mappings (
+    client_id, source_column, model_table, model_column,
+    is_custom_field, custom_field_name, transform_expression, regex_json
+) VALUES (
+    {client_id},
+    {source_column},
+    {model_table},
+    {model_column},
+    {is_custom_field},
+    {custom_field_name},
+    {transform_expression},
+    {regex_json}
+);
+"""
+
+def _sql_literal(value: Optional[str]) -> str:
+    """Quote a value as a SQL string literal, doubling embedded quotes; None becomes NULL"""
+    if value is None:
+        return "NULL"
+    return "'" + str(value).replace("'", "''") + "'"
+
 class ExportService:
     """Service for exporting crosswalk data in various formats"""
     
     @staticmethod
-    def export_crosswalk_csv(db: Session, profile_id: int) -> str:
-        """Export crosswalk as CSV string"""
+    def _get_mappings(db: Session, profile_id: int) -> Tuple[List[Any], Dict[int, List[Any]]]:
+        """Load a profile's mappings with their source column names, and their regex rules by source column id"""
+        # Two Core SELECTs returning plain rows: the exporters only read
+        # values, so ORM entities and identity-map bookkeeping are not needed
+        mappings = db.execute(
+            select(
+                CrosswalkMapping.source_column_id,
+                CrosswalkMapping.model_table,
+                CrosswalkMapping.model_column,
+                CrosswalkMapping.is_custom_field,
+                CrosswalkMapping.custom_field_name,
+                CrosswalkMapping.transform_expression,
+                CrosswalkMapping.notes,
+                SourceColumn.source_column
+            ).outerjoin(
+                SourceColumn, SourceColumn.id == CrosswalkMapping.source_column_id
+            ).where(
+                CrosswalkMapping.profile_id == profile_id
+            )
+        ).all()
+        
+        regex_rules_by_column = defaultdict(list)
+        source_column_ids = {mapping.source_column_id for mapping in mappings}
+        if source_column_ids:
+            regex_rules = db.execute(
+                select(
+                    RegexRule.source_column_id,
+                    RegexRule.rule_name,
+                    RegexRule.pattern,
+                    RegexRule.flags,
+                    RegexRule.description
+                ).where(RegexRule.source_column_id.in_(source_column_ids))
+            )
+            for rule in regex_rules:
+                regex_rules_by_column[rule.source_column_id].append(rule)
+        
+        return mappings, regex_rules_by_column
+    
+    @staticmethod
+    def _build_crosswalk_rows(db: Session, profile_id: int) -> Iterator[Dict[str, Any]]:
+        """Load a profile's mappings and return the crosswalk export rows shared by the CSV and Excel exports"""
+        # Queries run here, not in the returned generator, so a missing profile
+        # raises immediately and the rows can be consumed after the session closes
         profile = db.query(SourceProfile).filter(SourceProfile.id == profile_id).first()
         if not profile:
             raise ValueError("Profile not found")
         
         # Get all mappings with related data
-        mappings = db.query(CrosswalkMapping).filter(
-            CrosswalkMapping.profile_id == profile_id
-        ).all()
+        mappings, regex_rules_by_column = ExportService._get_mappings(db, profile_id)
         
-        # Prepare CSV data
-        csv_data = []
+        return ExportService._iter_crosswalk_rows(profile, mappings, regex_rules_by_column)
+    
+    @staticmethod
+    def _iter_crosswalk_rows(
+        profile: SourceProfile, mappings: List[Any], regex_rules_by_column: Dict[int, List[Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield one crosswalk export row per mapping"""
         for mapping in mappings:
-            source_column = db.query(SourceColumn).filter(
-                SourceColumn.id == mapping.source_column_id
-            ).first()
+            regex_rules = regex_rules_by_column.get(mapping.source_column_id, [])
             
-            regex_rules = db.query(RegexRule).filter(
-                RegexRule.source_column_id == mapping.source_column_id
-            ).all()
-            
-            csv_data.append({
+            yield {
                 'client_id': profile.client_id or '',
-                'source_column': source_column.source_column if source_column else '',
+                'source_column': mapping.source_column or '',
                 'model_table': mapping.model_table,
                 'model_column': mapping.model_column,
                 'is_custom_field': mapping.is_custom_field,
@@ -53,25 +137,50 @@ class ExportService:
                     'description': rule.description
                 } for rule in regex_rules]),
                 'notes': mapping.notes or ''
-            })
+            }
+    
+    @staticmethod
+    def export_crosswalk_csv(db: Session, profile_id: int) -> str:
+        """Export crosswalk as CSV string"""
+        return "".join(ExportService.iter_crosswalk_csv(db, profile_id))
+    
+    @staticmethod
+    def iter_crosswalk_csv(db: Session, profile_id: int) -> Iterator[str]:
+        """Export crosswalk as CSV, one line at a time"""
+        return ExportService._iter_csv_lines(ExportService._build_crosswalk_rows(db, profile_id))
+    
+    @staticmethod
+    def _iter_csv_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Format crosswalk export rows as CSV lines, header first"""
+        rows = iter(rows)
+        first_row = next(rows, None)
         
         # Convert to CSV
-        if not csv_data:
-            return "client_id,source_column,model_table,model_column,is_custom_field,custom_field_name,transform_expression,regex_rules,notes\n"
+        if first_row is None:
+            yield ",".join(_CROSSWALK_EXPORT_COLUMNS) + "\n"
+            return
         
+        # One small buffer is reused for every line instead of holding the
+        # whole file
         output = StringIO()
-        writer = csv.DictWriter(output, fieldnames=csv_data[0].keys())
+        writer = csv.DictWriter(output, fieldnames=_CROSSWALK_EXPORT_COLUMNS)
         writer.writeheader()
-        writer.writerows(csv_data)
-        return output.getvalue()
+        writer.writerow(first_row)
+        for row in rows:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            writer.writerow(row)
+        yield output.getvalue()
     
     @staticmethod
     def export_crosswalk_excel(db: Session, profile_id: int) -> bytes:
         """Export crosswalk as Excel bytes"""
-        csv_content = ExportService.export_crosswalk_csv(db, profile_id)
-        
-        # Convert CSV to DataFrame and then to Excel
-        df = pd.read_csv(StringIO(csv_content))
+        # Build the DataFrame from the rows directly rather than writing CSV
+        # and parsing it back
+        df = pd.DataFrame(
+            ExportService._build_crosswalk_rows(db, profile_id), columns=_CROSSWALK_EXPORT_COLUMNS
+        )
         
         output = BytesIO()
         with pd.ExcelWriter(output, engine='openpyxl') as writer:
@@ -87,22 +196,14 @@ class ExportService:
         if not profile:
             raise ValueError("Profile not found")
         
-        mappings = db.query(CrosswalkMapping).filter(
-            CrosswalkMapping.profile_id == profile_id
-        ).all()
+        mappings, regex_rules_by_column = ExportService._get_mappings(db, profile_id)
         
         json_mappings = []
         for mapping in mappings:
-            source_column = db.query(SourceColumn).filter(
-                SourceColumn.id == mapping.source_column_id
-            ).first()
-            
-            regex_rules = db.query(RegexRule).filter(
-                RegexRule.source_column_id == mapping.source_column_id
-            ).all()
+            regex_rules = regex_rules_by_column.get(mapping.source_column_id, [])
             
             mapping_data = {
-                "source_column": source_column.source_column if source_column else "",
+                "source_column": mapping.source_column or "",
                 "target": {
                     "table": mapping.model_table,
                     "column": mapping.model_column
@@ -135,40 +236,14 @@ class ExportService:
         if not profile:
             raise ValueError("Profile not found")
         
-        mappings = db.query(CrosswalkMapping).filter(
-            CrosswalkMapping.profile_id == profile_id
-        ).all()
+        mappings, regex_rules_by_column = ExportService._get_mappings(db, profile_id)
         
-        sql_lines = []
-        
-        # Create table DDL
-        sql_lines.append("-- Crosswalk table creation (idempotent)")
-        sql_lines.append("CREATE TABLE IF NOT EXISTS crosswalk_mappings (")
-        sql_lines.append("    id INTEGER PRIMARY KEY,")
-        sql_lines.append("    client_id VARCHAR(50),")
-        sql_lines.append("    source_column VARCHAR(255),")
-        sql_lines.append("    model_table VARCHAR(100),")
-        sql_lines.append("    model_column VARCHAR(100),")
-        sql_lines.append("    is_custom_field BOOLEAN DEFAULT FALSE,")
-        sql_lines.append("    custom_field_name VARCHAR(255),")
-        sql_lines.append("    transform_expression TEXT,")
-        sql_lines.append("    regex_json TEXT,")
-        sql_lines.append("    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,")
-        sql_lines.append("    UNIQUE(client_id, source_column)")
-        sql_lines.append(");")
-        sql_lines.append("")
-        
-        # Insert/Update statements
-        sql_lines.append("-- Upsert crosswalk mappings")
+        client_id = profile.client_id or 'DEFAULT'
         
+        # Create table DDL, then one upsert per mapping
+        sql_parts = [_CROSSWALK_DDL]
         for mapping in mappings:
-            source_column = db.query(SourceColumn).filter(
-                SourceColumn.id == mapping.source_column_id
-            ).first()
-            
-            regex_rules = db.query(RegexRule).filter(
-                RegexRule.source_column_id == mapping.source_column_id
-            ).all()
+            regex_rules = regex_rules_by_column.get(mapping.source_column_id, [])
             
             regex_json = json.dumps([{
                 'name': rule.rule_name,
@@ -177,49 +252,35 @@ class ExportService:
                 'description': rule.description
             } for rule in regex_rules])
             
-            client_id = profile.client_id or 'DEFAULT'
-            source_col = source_column.source_column if source_column else ''
-            
-            sql_lines.append(f"INSERT OR REPLACE INTO crosswalk_mappings (")
-            sql_lines.append(f"    client_id, source_column, model_table, model_column,")
-            sql_lines.append(f"    is_custom_field, custom_field_name, transform_expression, regex_json")
-            sql_lines.append(f") VALUES (")
-            sql_lines.append(f"    '{client_id}',")
-            sql_lines.append(f"    '{source_col}',")
-            sql_lines.append(f"    '{mapping.model_table}',")
-            sql_lines.append(f"    '{mapping.model_column}',")
-            sql_lines.append(f"    {1 if mapping.is_custom_field else 0},")
-            sql_lines.append(f"    '{mapping.custom_field_name or ''}',")
-            sql_lines.append(f"    '{mapping.transform_expression or ''}',")
-            sql_lines.append(f"    '{regex_json}'")
-            sql_lines.append(f");")
-            sql_lines.append("")
+            sql_parts.append(_CROSSWALK_UPSERT.format(
+                client_id=_sql_literal(client_id),
+                source_column=_sql_literal(mapping.source_column or ''),
+                model_table=_sql_literal(mapping.model_table),
+                model_column=_sql_literal(mapping.model_column),
+                is_custom_field=1 if mapping.is_custom_field else 0,
+                custom_field_name=_sql_literal(mapping.custom_field_name or ''),
+                transform_expression=_sql_literal(mapping.transform_expression or ''),
+                regex_json=_sql_literal(regex_json)
+            ))
         
         # Generate transformation view
-        sql_lines.append("-- Example transformation view")
-        sql_lines.append(f"CREATE OR REPLACE VIEW {profile.client_id or 'client'}_transformed AS")
-        sql_lines.append("SELECT")
-        
         select_clauses = []
         for mapping in mappings:
-            source_column = db.query(SourceColumn).filter(
-                SourceColumn.id == mapping.source_column_id
-            ).first()
-            
-            if source_column and mapping.transform_expression:
+            if mapping.source_column is not None and mapping.transform_expression:
                 # Translate DSL to SQL
                 sql_expr = DSLEngine.translate_to_sql(mapping.transform_expression)
                 target_col = mapping.custom_field_name if mapping.is_custom_field else mapping.model_column
                 select_clauses.append(f"    {sql_expr} AS {target_col}")
-            elif source_column:
+            elif mapping.source_column is not None:
                 target_col = mapping.custom_field_name if mapping.is_custom_field else mapping.model_column
-                select_clauses.append(f"    {source_column.source_column} AS {target_col}")
-        
-        if select_clauses:
-            sql_lines.append(",\n".join(select_clauses))
-        else:
-            sql_lines.append("    *")
+                select_clauses.append(f"    {mapping.source_column} AS {target_col}")
         
-        sql_lines.append(f"FROM {profile.raw_table_name or 'source_table'};")
+        select_sql = ",\n".join(select_clauses) if select_clauses else "    *"
+        sql_parts.append(
+            "-- Example transformation view\n"
+            f"CREATE OR REPLACE VIEW {profile.client_id or 'client'}_transformed AS\n"
+            f"SELECT\n{select_sql}\n"
+            f"FROM {profile.raw_table_name or 'source_table'};"
+        )
         
-        return "\n".join(sql_lines)
+        return "\n".join(sql_parts)
@@ -0,0 +1,13 @@
+"""
+Shared pytest setup for the backend.
+
+The backend modules use bare imports like ``from database import ...``, so
+the backend directory is put on ``sys.path`` the same way main.py does.
+"""
+
+import os
+import sys
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
@@ -0,0 +1,39 @@
+"""
+Auto mapping routes.
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from database.routes import auto_mapping
+
+
+@pytest.fixture
+def slow_mapper(monkeypatch):
+    """Swap in an AutoMapper that takes a while to build and counts its builds"""
+    builds = []
+
+    class SlowMapper:
+        def __init__(self):
+            builds.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(auto_mapping, "AutoMapper", SlowMapper)
+    monkeypatch.setattr(auto_mapping, "_mapper", None)
+    return builds
+
+
+def test_get_mapper_builds_once_under_concurrent_first_use(slow_mapper):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(auto_mapping.get_mapper())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(slow_mapper) == 1
+    assert all(mapper is slow_mapper[0] for mapper in results)
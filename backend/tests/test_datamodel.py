@@ -0,0 +1,163 @@
+"""
+Data model routes against the real pi20_data_model DDL.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("duckdb_engine")
+pytest.importorskip("fastapi")
+pytest.importorskip("fuzzywuzzy")
+pytest.importorskip("pandas")
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database.ddl.tables.create_pi20_data_model import create_pi20_data_model, pi20_data_model_indexes_ddl
+from database.routes import datamodel
+
+_DATA_MODEL_ROWS = [
+    ("Y", "MEMBER", "MEMBER_ID", "VARCHAR", 1, "Member identifier", 2, True, None, None, False, "MEMBER-MEMBER_ID"),
+    ("Y", "MEMBER", "MEMBER_FIRST_NAME", "VARCHAR", 2, "Member first name", 2, False, None, None, False, "MEMBER-MEMBER_FIRST_NAME"),
+    ("Y", "CLAIM", "CLAIM_ID", "VARCHAR", 1, "Claim identifier", 3, True, None, None, False, "CLAIM-CLAIM_ID"),
+    ("Y", "CLAIM", "PAID_AMOUNT", "NUMBER(18,2)", 2, "Amount paid", 3, False, None, None, False, "CLAIM-PAID_AMOUNT"),
+]
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory DuckDB holding the real pi20_data_model table"""
+    engine = create_engine("duckdb:///:memory:")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(create_pi20_data_model)
+        conn.exec_driver_sql(pi20_data_model_indexes_ddl)
+        conn.execute(
+            text("INSERT INTO pi20_data_model VALUES (:a, :b, :c, :d, :e, :f, :g, :h, :i, :j, :k, :l)"),
+            [dict(zip("abcdefghijkl", row)) for row in _DATA_MODEL_ROWS],
+        )
+    datamodel._reference_cache.clear()
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    datamodel._reference_cache.clear()
+    engine.dispose()
+
+
+def test_suggest_mapping_fuzzy_match(db):
+    suggestions = asyncio.run(datamodel.suggest_mapping(source_column="membr_id", db=db))
+
+    by_column = {s.column_name: s for s in suggestions}
+    assert "MEMBER_ID" in by_column
+    assert by_column["MEMBER_ID"].table_name == "MEMBER"
+    assert by_column["MEMBER_ID"].schema_layer == datamodel._SCHEMA_LAYER
+    assert 0.7 <= by_column["MEMBER_ID"].confidence_score < 1.0
+    assert by_column["MEMBER_ID"].reason.startswith("Similar column name")
+    assert "CLAIM_ID" not in by_column
+
+
+def test_suggest_mapping_exact_match(db):
+    suggestions = asyncio.run(datamodel.suggest_mapping(source_column="claim_id", db=db))
+
+    assert suggestions[0].column_name == "CLAIM_ID"
+    assert suggestions[0].confidence_score == 1.0
+
+
+def test_validate_mapping_describes_target(db):
+    result = asyncio.run(datamodel.validate_mapping(
+        {"in_model": "Y", "mcdm_column_name": "MEMBER_ID", "source_column_name": "mbr_id"}, db=db
+    ))
+
+    assert result.is_valid
+    assert "Consider data type formatting for VARCHAR" in result.suggestions
+    assert f"Target: {datamodel._SCHEMA_LAYER}.MEMBER.MEMBER_ID - Member identifier" in result.suggestions
+
+
+def test_suggest_sql_with_no_pattern_candidates(db):
+    rows = db.execute(datamodel._SUGGEST_SQL, {"column": "member_id", "fields": []}).fetchall()
+
+    assert [(row.schema_layer, row.table_name, row.column_name, row.is_exact) for row in rows] == [
+        (datamodel._SCHEMA_LAYER, "MEMBER", "MEMBER_ID", True)
+    ]
+
+
+def test_get_schema_layers(db):
+    assert asyncio.run(datamodel.get_schema_layers(db=db)) == [datamodel._SCHEMA_LAYER]
+
+
+def test_get_tables_by_schema_layer(db):
+    assert asyncio.run(datamodel.get_tables(db=db)) == ["CLAIM", "MEMBER"]
+    assert asyncio.run(datamodel.get_tables(schema_layer="pi20", db=db)) == ["CLAIM", "MEMBER"]
+    assert asyncio.run(datamodel.get_tables(schema_layer="RAW", db=db)) == []
+
+
+def test_get_field_info(db):
+    assert asyncio.run(datamodel.get_field_info("paid_amount", db=db)) == [{
+        "schema_layer": datamodel._SCHEMA_LAYER,
+        "table_name": "CLAIM",
+        "column_name": "PAID_AMOUNT",
+        "data_type": "NUMBER(18,2)",
+        "description": "Amount paid",
+        "is_mandatory": False,
+        "is_standard_field": True,
+        "is_case_sensitive": False,
+    }]
+
+
+def test_get_field_info_unknown_column(db):
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(datamodel.get_field_info("NOT_A_COLUMN", db=db))
+
+    assert excinfo.value.status_code == 404
+
+
+def _add_data_model_row(db, table_name, column_name):
+    db.execute(
+        text("INSERT INTO pi20_data_model (TABLE_NAME, COLUMN_NAME) VALUES (:table_name, :column_name)"),
+        {"table_name": table_name, "column_name": column_name},
+    )
+    db.commit()
+
+
+def test_get_schema_layers_is_cached(db):
+    first = asyncio.run(datamodel.get_schema_layers(db=db))
+    db.execute(text("DELETE FROM pi20_data_model"))
+    db.commit()
+
+    assert asyncio.run(datamodel.get_schema_layers(db=db)) == first
+
+    datamodel._reference_cache.clear()
+    assert asyncio.run(datamodel.get_schema_layers(db=db)) == []
+
+
+def test_get_tables_is_cached_per_schema_layer(db):
+    asyncio.run(datamodel.get_tables(db=db))
+    asyncio.run(datamodel.get_tables(schema_layer="PI20", db=db))
+    _add_data_model_row(db, "PROVIDER", "PROVIDER_SID")
+
+    assert asyncio.run(datamodel.get_tables(db=db)) == ["CLAIM", "MEMBER"]
+    assert asyncio.run(datamodel.get_tables(schema_layer="PI20", db=db)) == ["CLAIM", "MEMBER"]
+
+    datamodel._reference_cache.clear()
+    assert asyncio.run(datamodel.get_tables(schema_layer="PI20", db=db)) == ["CLAIM", "MEMBER", "PROVIDER"]
+
+
+def test_get_field_info_is_cached_per_column(db):
+    asyncio.run(datamodel.get_field_info("MEMBER_ID", db=db))
+    _add_data_model_row(db, "CLAIM", "MEMBER_ID")
+
+    assert [f["table_name"] for f in asyncio.run(datamodel.get_field_info("MEMBER_ID", db=db))] == ["MEMBER"]
+
+    datamodel._reference_cache.clear()
+    assert [f["table_name"] for f in asyncio.run(datamodel.get_field_info("MEMBER_ID", db=db))] == ["CLAIM", "MEMBER"]
+
+
+def test_validate_mapping_has_no_case_sensitivity_rule(db):
+    result = asyncio.run(datamodel.validate_mapping(
+        {"in_model": "Y", "mcdm_column_name": "MEMBER_FIRST_NAME", "source_column_name": "first_nm"}, db=db
+    ))
+
+    assert "VARCHAR_FIELDS_CASE_SENSITIVITY" not in {v["rule"] for v in result.rule_violations}
+    assert not any(s.startswith("Try: UPPER(") for s in result.suggestions)
@@ -0,0 +1,28 @@
+"""
+DSL expression validation and translation.
+"""
+
+from unittest import mock
+
+from services.dsl_engine import DSLEngine, _validate_expression
+
+
+def test_validate_expression_results_do_not_share_state():
+    first = DSLEngine.validate_expression("upper(col('name'))")
+    first["valid"] = False
+    first["message"] = "mutated"
+
+    assert DSLEngine.validate_expression("upper(col('name'))") == {"valid": True, "message": "Valid expression"}
+
+
+def test_validate_expression_nested_lists_are_copied_per_call():
+    _validate_expression.cache_clear()
+    result = {"valid": False, "message": "Invalid", "errors": ["bad call"]}
+    with mock.patch.object(DSLEngine, "_validate_expression", return_value=result):
+        first = DSLEngine.validate_expression("nested-list-expression")
+        first["errors"].append("caller's own note")
+        second = DSLEngine.validate_expression("nested-list-expression")
+    _validate_expression.cache_clear()
+
+    assert second == {"valid": False, "message": "Invalid", "errors": ["bad call"]}
+    assert first["errors"] is not second["errors"]
@@ -0,0 +1,138 @@
+"""
+Snowflake SQL export generation.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("duckdb_engine")
+pytest.importorskip("fastapi")
+
+from fastapi import Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database.ddl.tables.create_crosswalk_excel import crosswalk_template_excel_ddl
+from database.ddl.tables.create_pi20_data_model import create_pi20_data_model
+from database.routes import snowflake_export
+
+# The repo has no DDL script for the export log, so the test declares the
+# columns the routes read and write
+_SNOWFLAKE_SQL_EXPORTS_DDL = """
+CREATE SEQUENCE snowflake_sql_exports_id_seq;
+CREATE TABLE snowflake_sql_exports (
+    id INTEGER PRIMARY KEY DEFAULT nextval('snowflake_sql_exports_id_seq'),
+    client_id VARCHAR,
+    file_group VARCHAR,
+    export_type VARCHAR,
+    sql_content TEXT,
+    table_name VARCHAR,
+    created_by VARCHAR,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_deployed BOOLEAN DEFAULT FALSE
+);
+"""
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory DuckDB holding one client's crosswalk mappings"""
+    engine = create_engine("duckdb:///:memory:")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(create_pi20_data_model)
+        conn.exec_driver_sql(crosswalk_template_excel_ddl)
+        conn.exec_driver_sql(_SNOWFLAKE_SQL_EXPORTS_DDL)
+        conn.exec_driver_sql("""
+            INSERT INTO crosswalk_template (id, client_id, source_column_order, source_column_name,
+                                            file_group_name, mcdm_column_name)
+            VALUES (1, 'C1', 1, 'mbr_id', 'FG', 'MEMBER_ID')
+        """)
+    snowflake_export._generated_sql_cache.clear()
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    snowflake_export._generated_sql_cache.clear()
+    engine.dispose()
+
+
+def _mapping(**overrides):
+    """Stand-in for a crosswalk_template Row, read through ._mapping like the real one"""
+    values = {
+        "source_column_name": "mbr_id",
+        "source_column_order": 1,
+        "data_profile_info": None,
+        "client_id": "C1",
+        "in_model": "Y",
+        "mcdm_column_name": "MEMBER_ID",
+        "custom_field_type": None,
+        "mcs_review_required": False,
+        "source_column_formatting": None,
+        "provider_file_group": None,
+        "version_notes": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(_mapping=values)
+
+
+def _value_clauses(*mappings):
+    lines = list(snowflake_export.iter_insert_mapping_sql(mappings, "T", generated_at="2024-01-01T00:00:00"))
+    return [line.rstrip(",") for line in lines if line.startswith("(")]
+
+
+def test_insert_mapping_description_escapes_only_double_quotes():
+    clauses = _value_clauses(
+        _mapping(data_profile_info='it\'s "quoted"'),
+        _mapping(source_column_name="old_col", in_model="NOT USED", data_profile_info='it\'s "quoted"'),
+    )
+
+    assert clauses[0].startswith("('mbr_id','C1',1,\"\"\"it's \"\"quoted\"\"\"\"\",")
+    assert clauses[1].startswith("('old_col','C1',1,\"\"\"it's \"\"quoted\"\"\"\"\",")
+
+
+def test_insert_mapping_single_quoted_values_double_single_quotes():
+    clauses = _value_clauses(_mapping(source_column_name="member's id", client_id='O"Brien', version_notes="v1's"))
+
+    assert clauses[0].startswith("('member''s id','O\"Brien',1,")
+    assert clauses[0].endswith(",'v1''s')")
+
+
+def test_generate_sql_saves_each_request_with_its_own_timestamp(db):
+    def export(created_by):
+        request = snowflake_export.SnowflakeExport(
+            client_id="C1", export_type="INSERT_MAPPING", table_name="T", created_by=created_by
+        )
+        response = Response()
+        return response, snowflake_export.generate_snowflake_sql(request, response, stream=False, db=db)
+
+    first_response, first = export("alice")
+    second_response, second = export("bob")
+
+    # The second request reuses the first one's generated script
+    assert len(snowflake_export._generated_sql_cache) == 1
+    assert first["export_id"] != second["export_id"]
+    assert (first_response.status_code, second_response.status_code) == (201, 201)
+    assert second_response.headers["Location"] == snowflake_export._export_location(second["export_id"])
+
+    rows = db.execute(text("SELECT id, created_by, created_at, sql_content FROM snowflake_sql_exports ORDER BY id")).all()
+    assert [row.created_by for row in rows] == ["alice", "bob"]
+    for row, result in zip(rows, (first, second)):
+        stored = snowflake_export._decompress_sql(row.sql_content)
+        assert stored == result["sql_content"]
+        assert f"-- Generated at: {row.created_at.isoformat()}\n" in stored
+        assert snowflake_export._GENERATED_AT_PLACEHOLDER not in stored
+
+
+def test_get_export_sql_returns_json(db):
+    request = snowflake_export.SnowflakeExport(client_id="C1", export_type="CREATE_TABLE", table_name="T")
+    saved = snowflake_export.generate_snowflake_sql(request, Response(), stream=False, db=db)
+
+    assert snowflake_export.get_export_sql(saved["export_id"], db=db) == {"sql_content": saved["sql_content"]}
+
+
+def test_get_export_sql_reads_uncompressed_rows(db):
+    db.execute(text("INSERT INTO snowflake_sql_exports (id, sql_content) VALUES (100, 'SELECT 1;')"))
+    db.commit()
+
+    assert snowflake_export.get_export_sql(100, db=db) == {"sql_content": "SELECT 1;"}
@@ -27,6 +27,7 @@ import sys
 import json
 import asyncio
 import logging
+import threading
 from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
 from pathlib import Path
@@ -72,24 +73,40 @@ def get_db_session():
         logging.error(f"Database connection error: {e}")
         return None
 
+# One process-wide DuckDB connection, opened on first use; each query runs on
+# its own cursor, which is cheap and safe to use from any thread. Opened with
+# the default (read-write) config so it can coexist with the SQLAlchemy
+# engine when DUCKDB_PATH points at the same file.
+_duck_conn = None
+_duck_conn_lock = threading.Lock()
+
+def _get_duck_conn() -> "duckdb.DuckDBPyConnection":
+    """Return the shared DuckDB connection, opening it on first use"""
+    global _duck_conn
+    if _duck_conn is None:
+        with _duck_conn_lock:
+            if _duck_conn is None:
+                _duck_conn = duckdb.connect(DB_PATH)
+    return _duck_conn
+
 def execute_query(query: str, params: tuple = None) -> List[Dict]:
     """Execute raw SQL query and return results"""
     try:
-        conn = duckdb.connect(DB_PATH)
-        if params:
-            result = conn.execute(query, params).fetchall()
-        else:
-            result = conn.execute(query).fetchall()
-        
-        # Get column names
-        columns = [desc[0] for desc in conn.description] if conn.description else []
+        cursor = _get_duck_conn().cursor()
+        try:
+            if params:
+                result = cursor.execute(query, params).fetchall()
+            else:
+                result = cursor.execute(query).fetchall()
+            
+            # Get column names
+            columns = tuple(desc[0] for desc in cursor.description) if cursor.description else ()
+        finally:
+            cursor.close()
         
         # Convert to list of dictionaries
-        rows = []
-        for row in result:
-            rows.append(dict(zip(columns, row)))
+        rows = [dict(zip(columns, row)) for row in result]
         
-        conn.close()
         return rows
     except Exception as e:
         logging.error(f"Query execution error: {e}")
@@ -169,17 +186,18 @@ def get_profile_details(profile_id: int) -> Dict[str, Any]:
         Profile details with associated columns and mappings count
     """
     try:
+        # Count each child table independently; joining both onto the
+        # profile would fan out to columns x mappings rows before COUNT DISTINCT
         query = """
             SELECT p.id, p.name, p.client_id, p.created_at, p.updated_at,
                    p.has_physical_file, p.raw_table_name,
-                   COUNT(DISTINCT sc.id) as column_count,
-                   COUNT(DISTINCT cm.id) as mapping_count
+                   (SELECT COUNT(*) FROM source_columns sc WHERE sc.profile_id = p.id) as column_count,
+                   (SELECT COUNT(*) FROM crosswalk_mappings cm WHERE cm.profile_id = p.id) as mapping_count,
+                   (SELECT COUNT(DISTINCT cm.source_column_id) FROM crosswalk_mappings cm
+                     WHERE cm.profile_id = p.id
+                       AND (cm.model_column <> '' OR cm.custom_field_name <> '')) as mapped_column_count
             FROM source_profiles p
-            LEFT JOIN source_columns sc ON p.id = sc.profile_id
-            LEFT JOIN crosswalk_mappings cm ON p.id = cm.profile_id
             WHERE p.id = ?
-            GROUP BY p.id, p.name, p.client_id, p.created_at, p.updated_at,
-                     p.has_physical_file, p.raw_table_name
         """
         results = execute_query(query, (profile_id,))
         return results[0] if results else {"error": "Profile not found"}
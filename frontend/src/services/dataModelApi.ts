@@ -38,6 +38,7 @@ export interface FieldInfo {
   column_name: string;
   data_type: string;
   description: string;
+  is_mandatory: boolean;
   is_standard_field: boolean;
   is_case_sensitive: boolean;
 }